@@ -1,7 +1,8 @@
-from .imports import Playwright
-from .logs import log
+from .imports import Playwright, lru_cache
+from .logs import log, read_file_as_str, write_to_file
 from vars.exports import (
 	EDGE_USER_DATA_DIR,
+	LAST_PROFILE_PATH,
 	BrowserContext,
 	BROWSER,
 	TEST,
@@ -35,13 +36,41 @@ class SiteAccessError(Exception):
 #* Browser actions
 #* ---------------------------------------------------------------------------
 
-def list_edge_profiles() -> list[str]:
-	"""Return Edge profile folder names found in the user data directory."""
-	return [
-		folder
-		for folder in os.listdir(EDGE_USER_DATA_DIR)
-		if "profile" in folder.lower()
-	]
+@lru_cache(maxsize=1)
+def list_edge_profiles() -> tuple[str, ...]:
+	"""
+	Return Edge profile folder names found in the user data directory.
+
+	The directory is scanned once per run; scandir yields the entry type
+	alongside the name, so loose files are skipped without extra stat calls.
+	"""
+	with os.scandir(EDGE_USER_DATA_DIR) as entries:
+		return tuple(
+			entry.name
+			for entry in entries
+			if entry.is_dir(follow_symlinks=False) and "profile" in entry.name.lower()
+		)
+
+
+def _ordered_edge_profiles() -> list[str]:
+	"""
+	Return Edge profile folder names with the last known work profile first.
+
+	Launching Edge is the slowest step of the profile search, so probing the
+	profile that worked on the previous run usually avoids every other launch.
+	"""
+	profiles = list(list_edge_profiles())
+
+	try:
+		last_profile = read_file_as_str(LAST_PROFILE_PATH).strip()
+	except FileNotFoundError:
+		return profiles
+
+	if last_profile in profiles:
+		profiles.remove(last_profile)
+		profiles.insert(0, last_profile)
+
+	return profiles
 
 
 def goto(page: Page, url: str) -> Page:
@@ -61,28 +90,42 @@ def _launch_edge_context(p: Playwright, profile_path: str) -> BrowserContext:
 	)
 
 
-def _assert_site_access(browser: BrowserContext, profile: str, site: str) -> None:
+def _assert_sites_access(browser: BrowserContext, profile: str, sites: list[str]) -> None:
 	"""
-	Open a new page and verify it lands on the expected URL for the given site.
-	Closes the page and raises SiteAccessError if a redirect is detected.
+	Open one page per site and verify each lands on the expected URL.
+
+	Every navigation is started before any of them is awaited, so the sites
+	load concurrently and the check takes as long as the slowest one.
+	Closes the page and raises SiteAccessError on the first redirect detected.
 
 	Raises:
-		SiteAccessError: If the page does not land on the expected URL.
+		SiteAccessError: If a page does not land on the expected URL.
 	"""
-	expected_url = URLS[site]
-	page = goto(browser.new_page(), expected_url)
+	pages = [browser.new_page() for _ in sites]
 
-	if expected_url not in page.url:
-		page.close()
-		raise SiteAccessError(profile, site, page.url)
+	#* Only wait for each navigation to be committed so the next can start
+	for site, page in zip(sites, pages):
+		page.goto(URLS[site], wait_until="commit")
+
+	for site, page in zip(sites, pages):
+		expected_url = URLS[site]
+
+		#* Wait for the load rather than an exact URL match, so a redirect is
+		#* reported as missing access instead of timing out
+		page.wait_for_load_state()
+
+		if expected_url not in page.url:
+			page.close()
+			raise SiteAccessError(profile, site, page.url)
 
 
 def find_work_profile(p: Playwright) -> tuple[BrowserContext, Page, Page]:
 	"""
 	Find the first Edge profile with access to both Power BI and SharePoint.
 
-	Iterates available profiles, launching each in a persistent browser context
-	and verifying that navigation to both target sites succeeds without redirects.
+	Iterates available profiles, starting with the one found on the previous
+	run, launching each in a persistent browser context and verifying that
+	navigation to both target sites succeeds without redirects.
 
 	Args:
 		p: The Playwright instance used to launch browser contexts.
@@ -93,21 +136,22 @@ def find_work_profile(p: Playwright) -> tuple[BrowserContext, Page, Page]:
 	Raises:
 		EdgeProfileNotFoundError: If no profile with the required access is found.
 	"""
-	for profile in list_edge_profiles():
+	for profile in _ordered_edge_profiles():
 		profile_path = os.path.join(EDGE_USER_DATA_DIR, profile)
 		log(f"Checking profile: {profile}...", left_nl=1)
 
 		browser = _launch_edge_context(p, profile_path)
 
 		try:
-				for site in ["powerbi export", "sharepoint"]:
-					_assert_site_access(browser, profile, site)
+				_assert_sites_access(browser, profile, ["powerbi export", "sharepoint"])
 		except SiteAccessError as e:
 				log(str(e))
 				browser.close()
 				continue
 
 		log(f"Work profile found: {profile}")
+		write_to_file(LAST_PROFILE_PATH, profile)
+
 		powerbi, sharepoint = browser.pages[1], browser.pages[2]
 		return browser, powerbi, sharepoint
 
@@ -1,5 +1,5 @@
 from .str_actions import str_normalize
-from .imports import dt, td, pytz
+from .imports import ZoneInfo, dt, td, np, re
 from .logs import log
 from vars.exports import (
 	EMPTY_CELLS_REGEX,
@@ -15,21 +15,26 @@ from vars.exports import (
 	pd,
 )
 from .page import (
-	is_locator_scrolled_to_bottom,
 	sharepoint_close_editor,
+	sharepoint_paste_text,
+	scroll_inner_texts,
 	row_counter_info,
+	POWERBI_ROW_SEP,
 	powerbi_headers,
 	sharepoint_rows,
 	get_new_rows,
 	observe_rows,
-	powerbi_row,
 	wait_for,
 )
 
 
-_BRUSSELS_TZ = pytz.timezone("Europe/Brussels")
+_BRUSSELS_TZ = ZoneInfo("Europe/Brussels")
 _ROW_MISMATCH_RETRIES = 5
 
+#* Compiled once so the cleaning helpers do not re-parse the pattern per column
+_EMPTY_CELLS_RE = re.compile(EMPTY_CELLS_REGEX)
+_PLACEHOLDERS_RE = re.compile(r"\*NAME\*|\*URL\*")
+
 
 #* ---------------------------------------------------------------------------
 #* Exceptions
@@ -79,14 +84,14 @@ def _now_brussels() -> dt:
 def _localize_to_brussels(timestamp: dt) -> dt:
 	"""Attach or convert a datetime to the Europe/Brussels timezone."""
 	if timestamp.tzinfo is None:
-		return _BRUSSELS_TZ.localize(timestamp)
+		return timestamp.replace(tzinfo=_BRUSSELS_TZ)
 	return timestamp.astimezone(_BRUSSELS_TZ)
 
 
 def is_week_old(data: pd.DataFrame) -> bool:
 	"""Return True if the most recent date in the DataFrame is at least one week before yesterday."""
-	dates = pd.to_datetime(data[COLS["date"]])
-	last_date = _localize_to_brussels(dates.iloc[-1])
+	#* Only the last row matters, so parse that single cell instead of the column
+	last_date = _localize_to_brussels(pd.to_datetime(data[COLS["date"]].iat[-1]))
 	yesterday = _now_brussels() - td(days=1)
 	return (yesterday - last_date) >= td(weeks=1)
 
@@ -97,17 +102,25 @@ def is_week_old(data: pd.DataFrame) -> bool:
 
 def empty_cells_to_num(df: pd.DataFrame) -> pd.DataFrame:
 	"""Replace empty-cell matches in object columns with zero."""
-	for col in df.select_dtypes(include="object").columns:
-		df[col] = df[col].replace(EMPTY_CELLS_REGEX, 0, regex=True)
+	obj_cols = df.select_dtypes(include="object").columns
+
+	#* One frame-level replace covers every object column; an empty
+	#* selection would make the assignment below raise
+	if len(df) and len(obj_cols):
+		df[obj_cols] = df[obj_cols].replace(_EMPTY_CELLS_RE, 0, regex=True)
 	return df
 
 
 def drop_empty_cells(df: pd.DataFrame) -> pd.DataFrame:
 	"""Drop rows that contain NaN values or empty-cell matches in text columns."""
 	no_nulls = df.dropna()
-	has_empty = no_nulls[COLTYPES["text"]].apply(
-		lambda row: row.astype(str).str.match(EMPTY_CELLS_REGEX).any(), axis=1
-	)
+
+	#* OR together one vectorised match per text column instead of
+	#* testing every row individually
+	has_empty = pd.Series(False, index=no_nulls.index)
+	for col in COLTYPES["text"]:
+		has_empty |= no_nulls[col].astype(str).str.match(_EMPTY_CELLS_RE)
+
 	return no_nulls.loc[~has_empty]
 
 
@@ -120,17 +133,25 @@ def adjust_powerbi_excel_data(df: pd.DataFrame) -> pd.DataFrame:
 	- Appends a Date column set to yesterday (Brussels time).
 	- Drops empty rows and converts empty string cells to zero.
 	"""
-	top_parent = df[[COLS["account"]]]
-
 	#* Remove commas from numeric-like string columns so they can be cast later;
-	#* the account column is excluded because it may legitimately contain commas
-	body = df.drop(columns=COLS["account"]).map(
-		lambda x: x.replace(",", "") if isinstance(x, str) else x
+	#* the account column is excluded because it may legitimately contain commas.
+	#* Only object columns can hold strings, so numeric columns are left untouched;
+	#* all-string columns take the vectorised path, mixed ones keep non-strings as-is
+	obj_cols = df.select_dtypes(include="object").columns.drop(COLS["account"], errors="ignore")
+	for col in obj_cols:
+		if pd.api.types.infer_dtype(df[col], skipna=True) == "string":
+			df[col] = df[col].str.replace(",", "", regex=False)
+		else:
+			df[col] = df[col].map(lambda x: x.replace(",", "") if isinstance(x, str) else x)
+
+	#* Sort on a lowercased key column computed once rather than inside the sort
+	#* machinery; sort_values places missing accounts last instead of failing
+	df = (
+		df.assign(_sort_key=df[COLS["account"]].str.lower())
+			.sort_values("_sort_key", kind="stable")
+			.drop(columns="_sort_key")
 	)
 
-	df = pd.concat([top_parent, body], axis=1)
-	df = df.sort_values(by=COLS["account"], key=lambda col: col.str.lower())
-
 	#* Tag every row with yesterday's date — this export always represents
 	#* the previous day's snapshot in the Brussels timezone
 	yesterday = _now_brussels() - td(days=1)
@@ -147,8 +168,8 @@ def powerbi_excel_data() -> pd.DataFrame:
 	"""
 	Scrape and return all Power BI accounts data as a cleaned DataFrame.
 
-	Scrolls through the Power BI table incrementally, deduplicating rows,
-	until the bottom is reached.
+	Scrolls through the Power BI table incrementally until the bottom is
+	reached, then deduplicates and splits the collected rows in one pass.
 
 	Raises:
 		RowAttributeError: If a row element is missing its index attribute.
@@ -166,42 +187,22 @@ def powerbi_excel_data() -> pd.DataFrame:
 	top = wait_for(table, POWERBI_DOM, at=["top"])[0]
 	mid = wait_for(table, POWERBI_DOM, at=["mid"])[0]
 
-	data: list[list[str]] = []
-	seen_rows: set[str] = set()
-	row_num = 0
-
 	row_attr,   _ = POWERBI_DOM["row"]
 	index_attr, _ = POWERBI_DOM["index"]
 
-	while True:
-		#* Block until the expected row index is present in the DOM,
-		#* ensuring the virtual list has rendered before we read it
-		wait_for(mid, {"next_row": (f".row[row-index='{row_num}']", None)})
-
-		for row in (field.strip() for field in powerbi_row(mid)):
-			if row not in seen_rows:
-					data.append(row.split("\n"))
-					seen_rows.add(row)
-
-		if is_locator_scrolled_to_bottom(mid):
-			break
-
-		#* Advance by a third of the viewport so the virtual list renders
-		#* the next batch without skipping any rows at the boundary
-		mid.evaluate("el => el.scrollBy(0, el.clientHeight / 3)")
-
-		last_row = mid.locator(row_attr).last
-		raw_attr = last_row.get_attribute(index_attr)
+	#* The scroll loop runs in the browser and also splits each step's text
+	#* into rows there, handing back every row once despite overlapping steps
+	raw_rows, complete = scroll_inner_texts(mid, row_attr, index_attr, sep=POWERBI_ROW_SEP)
 
-		if raw_attr is None:
-			raise RowAttributeError(index_attr)
+	if not complete:
+		raise RowAttributeError(index_attr)
 
-		#* Track the index of the last visible row so the next wait_for
-		#* can block on the correct row appearing after the scroll
-		row_num = int(raw_attr)
-		powerbi.wait_for_timeout(500)
+	#* Rows arrive deduplicated; the drop stays as a cheap guard against
+	#* whitespace the browser's trim() treats differently
+	rows = pd.Series(raw_rows, dtype=object).str.strip()
+	rows = rows.drop_duplicates(ignore_index=True)
 
-	df = pd.DataFrame(data, columns=powerbi_headers(top))
+	df = pd.DataFrame([row.split("\n") for row in rows], columns=powerbi_headers(top))
 	log("PowerBI accounts data exported.")
 	return adjust_powerbi_excel_data(df)
 
@@ -214,7 +215,8 @@ def read_sharepoint_txt_data() -> pd.DataFrame:
 	"""
 	Parse tabular data from the SharePoint text editor and return it as a DataFrame.
 
-	Scrolls through the editor, accumulating semicolon-delimited rows. Retries
+	Scrolls through the editor, accumulating semicolon-delimited rows, and
+	splits them into columns once the end is reached. Retries
 	up to _ROW_MISMATCH_RETRIES times when row and counter counts diverge.
 
 	Raises:
@@ -237,7 +239,7 @@ def read_sharepoint_txt_data() -> pd.DataFrame:
 	observe_rows(sheet, "rows", sharepoint_rows(sheet), attr)
 	observe_rows(row_counter, "counter", row_counter_info(row_counter))
 
-	data: list[list[str]] = []
+	data: list[str] = []
 
 	#* prev_row buffers the last raw text fragment across scroll boundaries,
 	#* since a logical row can be split across two scroll windows
@@ -251,7 +253,7 @@ def read_sharepoint_txt_data() -> pd.DataFrame:
 		#* No new rows means we have reached the end of the document;
 		#* flush the buffered fragment and exit
 		if not new_rows:
-			data.append(prev_row.split(";"))
+			data.append(prev_row)
 			break
 
 		prev_row = _accumulate_rows(new_rows, counter, data, prev_row)
@@ -265,7 +267,8 @@ def read_sharepoint_txt_data() -> pd.DataFrame:
 		raise SharePointEmptyDataError("No data found in the SharePoint editor.")
 
 	#* Row 0 is the header; remaining rows are data
-	return pd.DataFrame(data[1:], columns=data[0])
+	header, *rows = data
+	return pd.DataFrame([row.split(";") for row in rows], columns=header.split(";"))
 
 
 def _read_rows_with_retry(sharepoint) -> tuple[list, list]:
@@ -304,7 +307,7 @@ def _read_rows_with_retry(sharepoint) -> tuple[list, list]:
 def _accumulate_rows(
 	new_rows: list[str],
 	counter: list,
-	data: list[list[str]],
+	data: list[str],
 	prev_row: str,
 ) -> str:
 	"""
@@ -324,23 +327,22 @@ def _accumulate_rows(
 	Args:
 		new_rows: Raw text fragments observed since the last scroll.
 		counter:  Parallel list of row-boundary signals (truthy = new row).
-		data:     Accumulator list; committed rows are appended here in-place.
+		data:     Accumulator list; committed raw rows are appended here in-place.
 		prev_row: The carry-over fragment from the previous scroll window.
 
 	Returns:
 		The updated prev_row buffer to carry into the next scroll window.
 	"""
-	for i, row in enumerate(new_rows):
-		row = str_normalize(row)
-
+	#* Normalise the whole batch up front and walk it alongside its counters
+	for row, opens_row in zip(map(str_normalize, new_rows), counter):
 		#* Bootstrap: nothing buffered yet, so just start the buffer
 		if not prev_row:
 			prev_row = row
 			continue
 
-		if counter[i]:
+		if opens_row:
 			#* This fragment opens a new logical row — commit the previous one
-			data.append(prev_row.split(";"))
+			data.append(prev_row)
 			prev_row = row
 		else:
 			#* This fragment continues the current logical row
@@ -400,42 +402,74 @@ def sharepoint_txt_data(desc: str, close_editor: bool = True, attempts: int = 5)
 #* TAM correction
 #* ---------------------------------------------------------------------------
 
+def _actual_tam_lookup(ae_ids: list[str]) -> pd.DataFrame:
+	"""
+	Explode ACTUAL["tam"] into one (AE, account, TAM) row per account.
+
+	Only the first entry of each AE ID in ae_ids is used, matching the
+	pipe-separated accounts with the comma-separated TAMs by position.
+
+	Raises:
+		TAMMismatchError: If the number of accounts and TAMs for an AE ID differ.
+	"""
+	actual_tam = ACTUAL["tam"]
+	actual_tam = actual_tam.loc[actual_tam["ID"].isin(ae_ids)].drop_duplicates("ID")
+
+	accounts = actual_tam["Accounts"].astype(str).str.split("|")
+	tams     = actual_tam["TAM"].astype(str).str.split(",")
+
+	mismatched = accounts.str.len() != tams.str.len()
+	if mismatched.any():
+		i = mismatched.idxmax()
+		raise TAMMismatchError(actual_tam.at[i, "ID"], len(accounts[i]), len(tams[i]))
+
+	#* Later duplicates of an account win, as they would when assigned in order
+	return (
+		actual_tam.assign(Accounts=accounts, TAM=tams)
+		.explode(["Accounts", "TAM"])
+		.rename(columns={"ID": COLS["ae"], "Accounts": COLS["account"], "TAM": "actual"})
+		.drop_duplicates([COLS["ae"], COLS["account"]], keep="last")
+		[[COLS["ae"], COLS["account"], "actual"]]
+	)
+
+
 def fix_tam(progress: pd.DataFrame) -> pd.DataFrame:
 	"""
 	Overwrite TAM values from ACTUAL data and recalculate adoption percentages.
 
-	For each AE ID present in the actual TAM lookup, replaces the stored TAM
-	figures per account, then recomputes adoption % as (adoption / TAM) * 100.
+	Joins the exploded actual TAM lookup onto progress by AE ID and account
+	to replace the stored TAM figures in a single pass, then recomputes
+	adoption % as (adoption / TAM) * 100.
 
 	Raises:
 		TAMMismatchError: If the number of accounts and TAMs for an AE ID differ.
 	"""
 	t, a, a_pct = COLS["tam"], COLS["adoption"], COLS["adoption %"]
-	actual_tam = ACTUAL["tam"]
+	keys = [COLS["ae"], COLS["account"]]
 
-	for ae_id in progress[COLS["ae"]].unique():
-		matches = actual_tam.loc[actual_tam["ID"] == ae_id]
+	lookup = _actual_tam_lookup(progress[COLS["ae"]].unique())
 
-		if matches.empty:
-			continue
-
-		accounts = str(matches["Accounts"].iat[0]).split("|")
-		tams     = str(matches["TAM"].iat[0]).split(",")
+	#* Nothing to correct when none of the AE IDs has an actual TAM entry
+	if lookup.empty:
+		return progress
 
-		if len(accounts) != len(tams):
-			raise TAMMismatchError(ae_id, len(accounts), len(tams))
+	actual = progress[keys].merge(lookup, on=keys, how="left")["actual"]
+	actual.index = progress.index
 
-		for account, tam in zip(accounts, tams):
-			mask = (progress[COLS["ae"]] == ae_id) & (progress[COLS["account"]] == account)
-			progress.loc[mask, t] = tam
+	matched = actual.notna()
+	progress.loc[matched, t] = actual[matched]
 
-		#* Exclude zero-TAM rows from the percentage calculation to avoid
-		#* division-by-zero; those rows keep whatever adoption % they had before
-		nonzero  = progress[t] != 0
-		adoption = progress.loc[nonzero, a].astype(int)
-		tam_vals = progress.loc[nonzero, t].astype(int)
+	#* Exclude zero-TAM rows from the percentage calculation to avoid
+	#* division-by-zero; those rows keep whatever adoption % they had before.
+	#* TAMs are cast once so the mask also catches zeros stored as text
+	tam_vals = progress[t].astype(int)
+	nonzero  = tam_vals != 0
+	adoption = progress.loc[nonzero, a].astype(int)
 
-		progress.loc[nonzero, a_pct] = (adoption / tam_vals * 100).map(lambda x: f"{x:.2f}%")
+	#* Format every percentage in one C-level sprintf pass
+	progress.loc[nonzero, a_pct] = np.char.mod(
+		"%.2f%%", (adoption / tam_vals[nonzero] * 100).to_numpy()
+	)
 
 	return progress
 
@@ -475,7 +509,7 @@ def try_update_accounts_data() -> pd.DataFrame:
 	log("Appending new snapshot rows...")
 	csv = new_data.to_csv(index=False, header=False, sep=";").strip()
 	sharepoint.keyboard.press("Enter")
-	sharepoint.keyboard.insert_text(csv)
+	sharepoint_paste_text(csv)
 	sharepoint.wait_for_timeout(500)
 
 	#* Click Save and wait for the confirmation popup before closing,
@@ -506,13 +540,13 @@ def set_structure_variables(role: str, names: str, url: str = "") -> pd.DataFram
 	"""
 	#* Extract only the first name from each "First Last" entry so the greeting
 	#* reads naturally even when multiple recipients are addressed together
-	first_names = ", ".join(name.split()[0] for name in names.split(","))
+	first_names = ", ".join(name.split(maxsplit=1)[0] for name in names.split(","))
+	replacements = {"*NAME*": first_names, "*URL*": url}
 
+	#* Substitute both placeholders in a single pass over the template text
 	structure = MAIL_STRUCTURES[role].copy()
-	structure["Text"] = (
-		structure["Text"]
-		.str.replace("*NAME*", first_names, regex=False)
-		.str.replace("*URL*", url, regex=False)
+	structure["Text"] = structure["Text"].str.replace(
+		_PLACEHOLDERS_RE, lambda match: replacements[match.group(0)], regex=True
 	)
 
 	return structure
@@ -2,24 +2,24 @@ from .imports import sync_playwright, tb
 from .outlook import send_new_mail
 from vars.exports import (
 	MAIL_STRUCTURES,
-	DEFAULT_EMAILS,
 	MAIL_LOGS,
 	EXCLUDED,
 	ACCOUNTS,
 	BROWSER,
-	TEST_TO,
-	TEST_CC,
 	PAGES,
+	VTEAM,
 	ACTUAL,
 	TEST,
 	LOGS,
 	SKIP,
 	URLS,
+	ENV,
 	pd,
 )
 from .mail_rules import (
 	handle_exclusions,
 	define_exclusions,
+	index_skip_emails,
 	define_filter,
 	prepare_mail,
 	adjust_to,
@@ -81,7 +81,7 @@ def choose_mode() -> str:
 #* V-team notification
 #* ---------------------------------------------------------------------------
 
-def notify_v_team(team: pd.Series) -> bool:
+def notify_v_team(team: VTEAM) -> bool:
 	"""
 	Prepare and send notification emails for a single v-team.
 
@@ -89,7 +89,7 @@ def notify_v_team(team: pd.Series) -> bool:
 	early if no valid recipient can be determined.
 
 	Args:
-		team: A Series row from the v-teams DataFrame, expected to contain
+		team: A row of the v-teams DataFrame by column name, expected to contain
 				at least "ID", "Role", "Names", "To", and "CC".
 
 	Returns:
@@ -102,7 +102,7 @@ def notify_v_team(team: pd.Series) -> bool:
 	log(f"Processing v-team of the {role}/s {names}...", left_nl=1)
 
 	#* In test mode, route all mail to the test address instead of the real recipient
-	raw_to: str = TEST_TO if TEST["active"] else team["To"].strip()
+	raw_to: str = ENV.test_to if TEST["active"] else team["To"].strip()
 	to: str = adjust_to(raw_to, ae_id)
 
 	if not to:
@@ -110,7 +110,7 @@ def notify_v_team(team: pd.Series) -> bool:
 		return False
 
 	#* In test mode, use the test CC list; otherwise merge the team CC with the default addresses
-	raw_cc: str = TEST_CC if TEST["active"] else f"{team['CC']} {DEFAULT_EMAILS}".strip()
+	raw_cc: str = ENV.test_cc if TEST["active"] else f"{team['CC']} {ENV.default_emails}".strip()
 	cc, exclusions = split_cc(raw_cc, ae_id, role)
 
 	#* settings is shared across prepare_mail calls so that the pics/structure
@@ -166,7 +166,13 @@ def notify_v_teams(v_teams: pd.DataFrame, accounts_filter: pd.DataFrame, dialog:
 	"""
 	progress_dialog = f"V-teams notified. {dialog}"
 
-	for _, v_team in v_teams.iterrows():
+	#* Plain tuples avoid boxing every v-team row into a Series; helpers still
+	#* read the row by column name
+	columns = v_teams.columns
+
+	for values in v_teams.itertuples(index=False, name=None):
+		v_team = dict(zip(columns, values))
+
 		#* Narrow the global account filter to only the rows relevant to this team
 		define_filter(v_team["ID"], accounts_filter)
 		clear_console()
@@ -203,7 +209,7 @@ def notify_exclusions(dialog: str) -> None:
 			)
 			send_new_mail(
 				to=email,
-				cc=DEFAULT_EMAILS.strip(),
+				cc=ENV.default_emails.strip(),
 				role=role,
 				names=data["name"],
 				structure=structure,
@@ -233,6 +239,8 @@ def notification_flow() -> None:
 	SKIP["emails"]  = sharepoint_txt_data("skip")
 	v_teams         = sharepoint_txt_data("V-teams")
 
+	index_skip_emails()
+
 	define_exclusions(sharepoint_txt_data("excluded"))
 
 	MAIL_STRUCTURES["AE"]       = sharepoint_txt_data("AE mail")
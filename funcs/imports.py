@@ -1,4 +1,14 @@
-from typing import Any, Callable, TypedDict
+from typing import Any, Callable, Iterable, TypedDict
 from datetime import datetime as dt, timedelta as td
-from playwright.sync_api import sync_playwright, Locator, Playwright
-import df2img, unicodedata as uni, io, pytz, base64, matplotlib.pyplot as plt, traceback as tb
+from functools import lru_cache
+from time import monotonic
+from concurrent.futures import ThreadPoolExecutor, Future
+from itertools import count
+from zoneinfo import ZoneInfo
+from playwright.sync_api import sync_playwright, Locator, Playwright, TimeoutError as PlaywrightTimeoutError
+import matplotlib
+
+#* Plots are only ever rendered to in-memory PNGs, so skip GUI backend discovery
+matplotlib.use("Agg")
+
+import df2img, unicodedata as uni, io, re, sys, base64, colorama, numpy as np, matplotlib.pyplot as plt, traceback as tb
@@ -1,14 +1,30 @@
 from vars.exports import LOGS, MAIL_LOGS, TEST, os
-from .imports import dt
+from .imports import ThreadPoolExecutor, Iterable, colorama, dt, sys
+
+
+_IO_BUFFER_SIZE = 1 << 17
+_LOG_MARKERS = {"START", "END"}
+
+#* The working directory never changes during a run, so resolve it once
+_ROOT_FOLDER = os.path.abspath(os.getcwd())
 
 
 #* ---------------------------------------------------------------------------
 #* Console
 #* ---------------------------------------------------------------------------
 
+#* Move the cursor home, then clear the screen and the scrollback buffer
+_CLEAR_SEQUENCE = "\x1b[H\x1b[2J\x1b[3J"
+
+#* Switch the Windows console into VT mode so that the escape sequences
+#* above are interpreted rather than printed; a no-op on other platforms
+colorama.just_fix_windows_console()
+
+
 def clear_console() -> None:
 	"""Clear the terminal screen on both Windows and Unix-like systems."""
-	os.system("cls" if os.name == "nt" else "clear")
+	sys.stdout.write(_CLEAR_SEQUENCE)
+	sys.stdout.flush()
 
 
 #* ---------------------------------------------------------------------------
@@ -23,14 +39,36 @@ def read_file_as_str(path: str) -> str:
 		FileNotFoundError: If no file exists at path.
 		IOError: If the file cannot be read.
 	"""
-	with open(path, "r", encoding="utf-8") as f:
-		return f.read()
+	#* A whole-file read needs no incremental decoder, so read the raw bytes
+	#* and decode them in one go; Windows line endings are folded the way
+	#* text mode would have done
+	with open(path, "rb", buffering=0) as f:
+		return f.read().decode("utf-8").replace("\r\n", "\n")
 
 
 def write_to_file(path: str, content: str) -> None:
-	"""Write content to a file, appending a trailing newline."""
-	with open(path, "w", encoding="utf-8") as f:
-		f.write(content + "\n")
+	"""
+	Write content to a file, appending a trailing newline.
+
+	The content is written to a temporary sibling file that then replaces
+	path, so an interrupted write never leaves a truncated file behind.
+	"""
+	tmp_path = f"{path}.tmp"
+
+	#* Two writes let the buffer coalesce them instead of copying content
+	#* just to attach the newline
+	with open(tmp_path, "w", encoding="utf-8", buffering=_IO_BUFFER_SIZE) as f:
+		f.write(content)
+		f.write("\n")
+
+	os.replace(tmp_path, path)
+
+
+def append_to_file(path: str, content: str) -> None:
+	"""Append content to a file, adding a trailing newline."""
+	with open(path, "a", encoding="utf-8", buffering=_IO_BUFFER_SIZE) as f:
+		f.write(content)
+		f.write("\n")
 
 
 def delete_file(path: str) -> None:
@@ -40,10 +78,9 @@ def delete_file(path: str) -> None:
 	Raises:
 		ValueError: If path resolves to a location outside the project root.
 	"""
-	root = os.path.abspath(os.getcwd())
 	abs_path = os.path.abspath(path)
 
-	if not abs_path.startswith(root):
+	if not abs_path.startswith(_ROOT_FOLDER):
 		raise ValueError(f"File {path!r} is outside the project root and cannot be deleted.")
 
 	try:
@@ -57,7 +94,7 @@ def delete_file(path: str) -> None:
 #* Log parsing
 #* ---------------------------------------------------------------------------
 
-def _parse_log_lines(lines: list[str]) -> set[str]:
+def _parse_log_lines(lines: Iterable[str]) -> set[str]:
 	"""
 	Extract the message portion from a sequence of log lines.
 
@@ -67,10 +104,13 @@ def _parse_log_lines(lines: list[str]) -> set[str]:
 	Returns:
 		A set of unique message strings.
 	"""
+	#* partition stops at the first separator without building a list, and
+	#* an empty separator covers both blank and malformed lines; each message
+	#* is stripped once and kept only if something is left
 	return {
-		line.split(" - ", maxsplit=1)[1].strip()
-		for line in lines
-		if line.strip() and " - " in line
+		message
+		for _, sep, tail in (line.partition(" - ") for line in lines)
+		if sep and (message := tail.strip())
 	}
 
 
@@ -95,8 +135,9 @@ def logs_file_to_set(path: str) -> set[str]:
 		FileNotFoundError: If no file exists at path.
 	"""
 	try:
-		with open(path, "r", encoding="utf-8") as f:
-			return _parse_log_lines(f.readlines())
+		#* Stream the file line by line instead of loading it as a list first
+		with open(path, "r", encoding="utf-8", buffering=_IO_BUFFER_SIZE) as f:
+			return _parse_log_lines(f)
 	except FileNotFoundError:
 		raise FileNotFoundError(f"Log file not found: {path!r}")
 
@@ -105,6 +146,25 @@ def logs_file_to_set(path: str) -> set[str]:
 #* Logging
 #* ---------------------------------------------------------------------------
 
+def _read_previous_logs(path: str) -> str:
+	"""Return a log file's content, or an empty string if it was never written."""
+	try:
+		return read_file_as_str(path)
+	except FileNotFoundError:
+		return ""
+
+
+def _seed_logs(type: dict, previous: str) -> None:
+	"""
+	Prepend a previous session's content to a log buffer.
+
+	That content is already on disk, so "saved" is moved to where the
+	unsaved part of the buffer starts.
+	"""
+	type["content"] = previous + type["content"]
+	type["saved"] = len(previous)
+
+
 def log(
 	message: str = "",
 	type: dict = LOGS,
@@ -118,13 +178,14 @@ def log(
 	Append a timestamped message to an in-memory log buffer, optionally flushing to disk.
 
 	Each non-empty line in message is stored as "<timestamp> - <line>".
-	When write=True the buffer is persisted only if it contains at least one
-	meaningful entry (START and END markers are excluded from the count).
+	When write=True the buffer is persisted only if at least one meaningful
+	entry was logged this session (START and END markers are not counted).
 
 	Args:
 		message:   Text to log. Multi-line strings are split and stored line by line.
-		type:      Log target dict with "path" and "content" keys. Defaults to LOGS.
-		write:     Flush the buffer to type["path"] after appending. Defaults to False.
+		type:      Log target dict with "path", "content", "saved" and "entries" keys.
+						Defaults to LOGS.
+		write:     Append the unsaved part of the buffer to type["path"]. Defaults to False.
 		silent:    Suppress stdout output. Defaults to False.
 		left_nl:   Blank lines to prepend before each stored entry. Defaults to 0.
 		right_nl:  Blank lines to append after each stored entry. Defaults to 1.
@@ -135,23 +196,30 @@ def log(
 	suffix = "\n" * right_nl
 	timestamp = dt.now().strftime("%Y-%m-%d %H:%M:%S")
 
-	#* Seed the in-memory buffer with whatever was written in a previous session
-	if from_last and os.path.exists(type["path"]):
-		type["content"] = read_file_as_str(type["path"]) + type["content"]
+	#* Seed the in-memory buffer with whatever was written in a previous session;
+	#* that part is already on disk, so remember where the unsaved content starts
+	if from_last:
+		_seed_logs(type, _read_previous_logs(type["path"]))
 
 	if message.strip():
-		for line in message.splitlines():
-			if line.strip():
-				type["content"] += f"{prefix}{timestamp} - {line}{suffix}"
+		#* Collect the message's lines and join them onto the buffer once,
+		#* rather than growing the whole buffer string line by line
+		lines = [line for line in message.splitlines() if line.strip()]
+		type["content"] += "".join(f"{prefix}{timestamp} - {line}{suffix}" for line in lines)
+
+		#* Keep a running count of meaningful entries so writing never
+		#* has to re-parse the whole buffer
+		type["entries"] += sum(line.strip() not in _LOG_MARKERS for line in lines)
 
 		if not silent:
 			print(f"{prefix}{message}{suffix}", end="")
 
 	if write:
-		#* Exclude bookkeeping markers before deciding whether to persist
-		entries = logs_to_set(type["content"]) - {"START", "END"}
-		if entries:
-			write_to_file(type["path"], type["content"])
+		#* Bookkeeping markers alone are not worth persisting
+		if type["entries"]:
+			#* Only append what is not on disk yet rather than rewriting the file
+			append_to_file(type["path"], type["content"][type["saved"]:])
+			type["saved"] = len(type["content"])
 
 
 #* ---------------------------------------------------------------------------
@@ -233,5 +301,11 @@ def adjust_logs() -> None:
 		LOGS["path"]      = f"test_{LOGS['path']}"
 		MAIL_LOGS["path"] = f"test_{MAIL_LOGS['path']}"
 
-	log(from_last=True)
-	log(type=MAIL_LOGS, from_last=True)
+	#* Equivalent to log(from_last=True) for each buffer, but the two files
+	#* are independent, so their reads are overlapped
+	targets = (LOGS, MAIL_LOGS)
+	with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+		previous = list(pool.map(_read_previous_logs, (target["path"] for target in targets)))
+
+	for target, content in zip(targets, previous):
+		_seed_logs(target, content)
@@ -1,22 +1,23 @@
 from .dataframe import set_structure_variables
 from .str_actions import str_normalize
-from .imports import Callable, Any
+from .imports import Callable, Any, re
 from .logs import log
 from vars.exports import (
-	TEST_EXCLUDED_NAMES,
-	TEST_EXCLUDED,
 	MEDIA_LABELS,
+	SKIP_INDEX,
 	EXCLUDED,
 	ACCOUNTS,
+	VTEAM,
 	TEST,
 	SKIP,
 	IMG,
+	ENV,
 	pd,
 )
 from .media import (
 	capture_powerbi_elements,
 	plot_ae_progress,
-	img_to_b64,
+	imgs_to_b64,
 )
 
 
@@ -29,7 +30,7 @@ class TestExclusionMismatchError(ValueError):
 
 	def __init__(self, n_emails: int, n_names: int) -> None:
 		super().__init__(
-			f"TEST_EXCLUDED has {n_emails} email(s) but TEST_EXCLUDED_NAMES has {n_names} name(s)."
+			f"test_excluded has {n_emails} email(s) but test_excluded_names has {n_names} name(s)."
 		)
 
 
@@ -41,7 +42,7 @@ _SETTINGS_KEYS = ("pics", "structure")
 
 
 def prepare_mail(
-	team: pd.Series,
+	team: VTEAM,
 	settings: dict[str, Any | None],
 	execute: Callable[..., Any],
 	params: dict[str, Any] | None = None,
@@ -54,7 +55,7 @@ def prepare_mail(
 	the existing params to avoid redundant captures.
 
 	Args:
-		team:     Series row for the current v-team (must contain "Role" and "Names").
+		team:     Row for the current v-team (must contain "Role" and "Names").
 		settings: Shared dict that caches generated pics and structure across
 					multiple calls for the same team.
 		execute:  Callable invoked with the final merged params.
@@ -68,7 +69,7 @@ def prepare_mail(
 		params = {}
 
 	#* Short-circuit if a previous prepare_mail call already generated the assets
-	if all(settings[key] is not None for key in _SETTINGS_KEYS):
+	if settings["pics"] is not None and settings["structure"] is not None:
 		execute(**params)
 		return
 
@@ -92,14 +93,26 @@ def prepare_mail(
 #* Email address filtering
 #* ---------------------------------------------------------------------------
 
-def _build_skip_set(id: str) -> set[str]:
+def index_skip_emails() -> None:
+	"""
+	Index SKIP["emails"] by AE ID into SKIP_INDEX.
+
+	Must be called whenever SKIP["emails"] is loaded, so that recipient
+	filtering can look skips up without touching the DataFrame. Global skips
+	(rows with an empty ID) are stored under the "" key.
+	"""
+	SKIP_INDEX.clear()
+	for ae_id, emails in SKIP["emails"].groupby("ID")["Email"]:
+		SKIP_INDEX[ae_id] = frozenset(emails.tolist())
+
+
+def _build_skip_set(id: str) -> frozenset[str]:
 	"""
 	Return the set of email addresses that should be skipped for the given AE ID.
 
 	Includes both ID-specific skips and global skips (where ID is an empty string).
 	"""
-	to_skip = SKIP["emails"]
-	return set(to_skip.loc[to_skip["ID"].isin([id, ""]), "Email"].values)
+	return SKIP_INDEX.get("", frozenset()) | SKIP_INDEX.get(id, frozenset())
 
 
 def adjust_to(to: str, ae_id: str) -> str:
@@ -168,11 +181,15 @@ def split_cc(
 #* Exclusion handling
 #* ---------------------------------------------------------------------------
 
+#* Matches commands mentioning both "save" and "visual", in either order
+_SAVE_VISUAL_RE = re.compile(r"save.*visual|visual.*save", re.DOTALL)
+
+
 def handle_exclusions(
 	exclusions: list[tuple[str, str]],
 	structure: pd.DataFrame,
 	pics: list[IMG],
-	team: pd.Series,
+	team: VTEAM,
 ) -> None:
 	"""
 	Store the relevant visual captures for each excluded email address.
@@ -186,33 +203,38 @@ def handle_exclusions(
 		structure:  Mail structure DataFrame; rows with a "save visual: <id>"
 						command identify which pics to capture.
 		pics:       Ordered list of captured images (indexed via MEDIA_LABELS).
-		team:       Series row for the current v-team.
+		team:       Row for the current v-team.
 	"""
-	#* Identify rows that instruct us to save a specific visual for excluded recipients
-	saved_visuals = structure[
-		structure["Command"].str.contains("visual", na=False) &
-		structure["Command"].str.contains("save", na=False)
-	]
+	#* Identify rows that instruct us to save a specific visual for excluded recipients;
+	#* one vectorised pass over the column, non-string cells never match
+	saved_visuals = structure[structure["Command"].str.contains(_SAVE_VISUAL_RE, na=False)]
 
 	role = team["Role"]
 
-	for email, _ in exclusions:
-		excluded_entry = EXCLUDED[role][email]
+	#* Command format: "save visual: <visual_id>"
+	visual_ids = [command.split(": ", maxsplit=1)[1] for command in saved_visuals["Command"].to_numpy()]
+
+	#* Captions and encodings are the same for every excluded address, so
+	#* build them once up front; a visual saved under several captions is
+	#* still only encoded once, and distinct visuals are encoded concurrently
+	unique_ids = list(dict.fromkeys(visual_ids))
+	unique_pics = [pics[MEDIA_LABELS[visual_id]] for visual_id in unique_ids]
+	encoded = dict(zip(unique_ids, imgs_to_b64(unique_pics)))
 
-		for _, row in saved_visuals.iterrows():
-			#* Command format: "save visual: <visual_id>"
-			_, visual_id = row["Command"].split(": ", maxsplit=1)
-			visual = pics[MEDIA_LABELS[visual_id]]
+	visuals: dict[str, str] = {
+		f"{team['Names']} ({team['ID']}) - {text}": encoded[visual_id]
+		for visual_id, text in zip(visual_ids, saved_visuals["Text"].to_numpy())
+	}
 
-			caption = f"{team['Names']} ({team['ID']}) - {row['Text']}"
-			excluded_entry["pics"][caption] = img_to_b64(visual)
+	for email, _ in exclusions:
+		EXCLUDED[role][email]["pics"].update(visuals)
 
 
 def define_exclusions(exclusions: pd.DataFrame) -> None:
 	"""
 	Populate the global EXCLUDED dict from a SharePoint exclusions DataFrame.
 
-	In test mode, TEST_EXCLUDED and TEST_EXCLUDED_NAMES are used instead of
+	In test mode, ENV.test_excluded and ENV.test_excluded_names are used instead of
 	the real data, and every role receives the same test addresses.
 
 	Args:
@@ -223,30 +245,31 @@ def define_exclusions(exclusions: pd.DataFrame) -> None:
 		TestExclusionMismatchError: If test mode is active and the number of
 											test emails and names differ.
 	"""
-	roles = exclusions["V-team role"].unique()
-
 	test_emails = []
 	test_names  = []
 	if TEST["active"]:
-		test_emails = TEST_EXCLUDED.split()
-		test_names  = TEST_EXCLUDED_NAMES.split(", ")
+		test_emails = ENV.test_excluded.split()
+		test_names  = ENV.test_excluded_names.split(", ")
 
 		if len(test_emails) != len(test_names):
 			raise TestExclusionMismatchError(len(test_emails), len(test_names))
 
-	for role in roles:
-		role = str_normalize(role)
+	#* Group on the normalised role in one pass instead of masking the whole
+	#* frame once per role
+	by_role = exclusions.groupby(exclusions["V-team role"].map(str_normalize), sort=False)
+
+	for role, role_rows in by_role:
 		EXCLUDED.setdefault(role, {})
 
 		if TEST["active"]:
-			for email, name in zip(test_emails, test_names):
-					EXCLUDED[role][email] = {"name": name, "pics": {}}
+			pairs = zip(test_emails, test_names)
 		else:
-			role_rows = exclusions.loc[exclusions["V-team role"] == role]
-			for _, row in role_rows.iterrows():
-				email = str_normalize(row["Email"])
-				name  = str_normalize(row["FullName"])
-				EXCLUDED[role][email] = {"name": name, "pics": {}}
+			emails = role_rows["Email"].map(str_normalize).to_numpy()
+			names  = role_rows["FullName"].map(str_normalize).to_numpy()
+			pairs  = zip(emails, names)
+
+		for email, name in pairs:
+			EXCLUDED[role][email] = {"name": name, "pics": {}}
 
 
 #* ---------------------------------------------------------------------------
@@ -1,4 +1,4 @@
-from .imports import io, Locator, dt, plt, df2img, base64
+from .imports import ThreadPoolExecutor, Future, count, io, np, Locator, dt, plt, df2img, base64
 from .str_actions import str_normalize
 from .browser import goto
 from .logs import log
@@ -6,14 +6,17 @@ from vars.exports import (
 	IMAGE_CROP_THRESHOLD,
 	DF2IMG_OPTIONS,
 	POWERBI_DOM,
+	MEDIA_B64,
 	ACCOUNTS,
 	COLTYPES,
 	ACTUAL,
 	Image,
 	PAGES,
 	MEDIA,
+	VTEAM,
 	COLS,
 	IMG,
+	os,
 	pd,
 )
 from .page import (
@@ -50,6 +53,15 @@ class NoFilteredAccountsError(ValueError):
 #* Image helpers
 #* ---------------------------------------------------------------------------
 
+#* Pillow's zlib PNG compression releases the GIL and is most of the work
+#* (binascii holds it for the base64 step, which is cheap), so use the cores
+_B64_WORKERS = min(8, os.cpu_count() or 1)
+_RESIZE_REDUCING_GAP = 2.0
+
+#* In-memory PNGs are short-lived, so favour encoding speed over size
+_PNG_COMPRESS_LEVEL = 1
+
+
 def img_to_b64(pic: IMG | str) -> str:
 	"""
 	Encode an image as a base64 PNG string.
@@ -65,14 +77,37 @@ def img_to_b64(pic: IMG | str) -> str:
 		pic = crop_pic(Image.open(pic).convert("RGBA"))
 
 	buf = io.BytesIO()
-	pic.save(buf, format="PNG")
-	buf.seek(0)
-	return base64.b64encode(buf.read()).decode("utf-8")
+	pic.save(buf, format="PNG", compress_level=_PNG_COMPRESS_LEVEL)
+
+	#* Encode straight from the buffer's memory instead of reading it back out
+	with buf.getbuffer() as png:
+		return base64.b64encode(png).decode("ascii")
+
+
+def shared_img_to_b64(key: str, pic: IMG | str) -> str:
+	"""
+	Return img_to_b64(pic), encoding it only the first time key is seen.
+
+	Meant for visuals that are identical in every mail of a run, such as the
+	cached MEDIA captures or the incentives slide.
+	"""
+	if key not in MEDIA_B64:
+		MEDIA_B64[key] = img_to_b64(pic)
+	return MEDIA_B64[key]
 
 
 def imgs_to_b64(pics: list[IMG]) -> list[str]:
-	"""Return a list of base64-encoded PNG strings from a list of IMG objects."""
-	return [img_to_b64(pic) for pic in pics]
+	"""
+	Return a list of base64-encoded PNG strings from a list of IMG objects.
+
+	PNG compression, the bulk of the work, releases the GIL, so several
+	images are encoded on a small thread pool; order is preserved.
+	"""
+	if len(pics) < 2:
+		return [img_to_b64(pic) for pic in pics]
+
+	with ThreadPoolExecutor(max_workers=min(_B64_WORKERS, len(pics))) as pool:
+		return list(pool.map(img_to_b64, pics))
 
 
 def crop_pic(image: IMG, path: str | None = None, target_width: int = 850, increase_threshold: int = 0) -> IMG:
@@ -95,32 +130,38 @@ def crop_pic(image: IMG, path: str | None = None, target_width: int = 850, incre
 	"""
 	threshold = IMAGE_CROP_THRESHOLD + increase_threshold
 
-	#* Replace near-white pixels with transparent ones so getbbox() can find content
-	cleaned = [
-		(255, 255, 255, 0) if all(channel > threshold for channel in pixel[:3]) else pixel
-		for pixel in image.getdata()
-	]
-	image.putdata(cleaned)
-
-	bbox = image.getbbox()
-	if bbox:
-		cropped = image.crop(bbox)
-		if cropped.mode != "RGBA":
-			cropped = cropped.convert("RGBA")
-
-		#* Flatten onto a white background to remove the transparency channel
-		result = Image.new("RGB", cropped.size, (255, 255, 255))
-		result.paste(cropped, mask=cropped.split()[3])
+	#* Replace near-white pixels with transparent ones so the content can be
+	#* located; a single mask over the pixel array instead of a per-pixel loop
+	pixels = np.array(image.convert("RGBA"))
+	near_white = (pixels[..., :3] > threshold).all(axis=-1)
+	pixels[near_white] = (255, 255, 255, 0)
+
+	#* Take the bounding box of the non-transparent pixels from the array
+	#* already in memory rather than having getbbox() scan a new image
+	visible = pixels[..., 3] != 0
+	rows = np.flatnonzero(visible.any(axis=1))
+	cols = np.flatnonzero(visible.any(axis=0))
+
+	if rows.size:
+		cropped = Image.fromarray(pixels[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1])
+
+		#* Flatten onto a white background to remove the transparency channel;
+		#* one composite call instead of splitting out the alpha band to paste with
+		background = Image.new("RGBA", cropped.size, (255, 255, 255, 255))
+		result = Image.alpha_composite(background, cropped).convert("RGB")
 	else:
 		#* Nothing to crop — fall back to the original as RGB
-		result = image.convert("RGB")
+		result = Image.fromarray(pixels).convert("RGB")
 
 	if path:
 		result.save(path)
 
 	scale = target_width / result.size[0]
 	target_height = int(result.size[1] * scale)
-	return result.resize((target_width, target_height))
+
+	#* When shrinking, reduce by whole factors with a cheap box filter first so
+	#* the resampling filter only runs on a roughly 2x larger image
+	return result.resize((target_width, target_height), reducing_gap=_RESIZE_REDUCING_GAP)
 
 
 def stack_images_vertically(img1: IMG, img2: IMG, gap: int = 25) -> IMG:
@@ -144,18 +185,26 @@ def stack_images_vertically(img1: IMG, img2: IMG, gap: int = 25) -> IMG:
 	if img1.width != img2.width:
 		raise ImageWidthMismatchError(img1.width, img2.width)
 
-	total_height = img1.height + gap + img2.height
-	canvas = Image.new("RGB", (img1.width, total_height), color=(255, 255, 255))
-	canvas.paste(img1, (0, 0))
-	canvas.paste(img2, (0, img1.height + gap))
+	#* Concatenate the pixel rows directly rather than filling a white canvas
+	#* and pasting both images over most of it
+	top    = np.asarray(img1)
+	bottom = np.asarray(img2)
+	spacer = np.full((gap, img1.width, 3), 255, dtype=np.uint8)
 
-	return canvas
+	return Image.fromarray(np.vstack((top, spacer, bottom)))
 
 
 #* ---------------------------------------------------------------------------
 #* Screenshot capture
 #* ---------------------------------------------------------------------------
 
+#* Pillow resizing and NumPy masking release the GIL, so size the pool like
+#* the encoding one
+_CROP_WORKERS = min(8, os.cpu_count() or 1)
+_SHOT_PREFIX  = dt.now().strftime("%Y%m%d-%H%M%S")
+_SHOT_COUNTER = count()
+
+
 def capture(elements: list[Locator], save: bool = False) -> list[IMG]:
 	"""
 	Screenshot, crop, and optionally save each element in elements.
@@ -168,24 +217,28 @@ def capture(elements: list[Locator], save: bool = False) -> list[IMG]:
 		List of cropped IMG objects in the same order as elements.
 	"""
 	log("Capturing screenshots...", left_nl=1)
-	screenshots: list[IMG] = []
-
-	for element in elements:
-		element.wait_for(state="attached", timeout=5000)
-		element.scroll_into_view_if_needed()
-		element.wait_for(state="visible", timeout=5000)
-
-		raw = element.screenshot(type="png", scale="device")
-		screenshot = Image.open(io.BytesIO(raw)).convert("RGBA")
-		cropped = crop_pic(screenshot)
-		screenshots.append(cropped)
-
-		if save:
-			#* Use the sub-second timestamp fragment as a lightweight unique ID
-			unique_id = hex(int(dt.now().strftime("%f")))[2:][-6:]
-			screenshot.save(f"{unique_id}.png")
-			log(f"Screenshot saved as {unique_id}.png")
-
+	crops: list[Future[IMG]] = []
+
+	#* Playwright must stay on this thread, but cropping is pure Pillow/NumPy
+	#* work, so each crop runs in the background while the next element is captured
+	with ThreadPoolExecutor(max_workers=_CROP_WORKERS) as pool:
+		for element in elements:
+			element.wait_for(state="attached", timeout=5000)
+			element.scroll_into_view_if_needed()
+			element.wait_for(state="visible", timeout=5000)
+
+			raw = element.screenshot(type="png", scale="device")
+			screenshot = Image.open(io.BytesIO(raw)).convert("RGBA")
+			crops.append(pool.submit(crop_pic, screenshot))
+
+			if save:
+				#* A per-run counter cannot collide within a run, unlike a timestamp
+				#* fragment, and the run prefix keeps earlier runs' files intact
+				unique_id = f"{_SHOT_PREFIX}-{next(_SHOT_COUNTER):04d}"
+				screenshot.save(f"{unique_id}.png")
+				log(f"Screenshot saved as {unique_id}.png")
+
+	screenshots = [crop.result() for crop in crops]
 	log("Screenshots captured.")
 	return screenshots
 
@@ -194,7 +247,13 @@ def capture(elements: list[Locator], save: bool = False) -> list[IMG]:
 #* Power BI capture
 #* ---------------------------------------------------------------------------
 
-def capture_powerbi_elements(team: pd.Series, save: bool = False) -> tuple[list[IMG], str]:
+#* Power BI toggles a slicer option by flipping its aria-selected attribute
+_SELECTION_CHANGED = "([el, was]) => el.getAttribute('aria-selected') !== was"
+_FILTER_APPLIED = """([el, loader]) =>
+	el.getAttribute('aria-selected') === 'true' && !document.querySelector(loader)"""
+
+
+def capture_powerbi_elements(team: VTEAM, save: bool = False) -> tuple[list[IMG], str]:
 	"""
 	Filter the Power BI dashboard to a specific team and capture the relevant visuals.
 
@@ -203,7 +262,7 @@ def capture_powerbi_elements(team: pd.Series, save: bool = False) -> tuple[list[
 	active; otherwise captures the raw snapshot panel.
 
 	Args:
-		team: Series row with at least "Role" and "ID" fields.
+		team: V-team row with at least "Role" and "ID" fields.
 		save: Forward the save flag to capture(). Defaults to False.
 
 	Returns:
@@ -240,11 +299,28 @@ def capture_powerbi_elements(team: pd.Series, save: bool = False) -> tuple[list[
 		powerbi, dropdown, at="option", go_down=False, text_filter="Select all"
 	)
 	already_selected = select_all.get_attribute("aria-selected") == "true"
-	click_and_wait(select_all, powerbi, clicks=1 if already_selected else 2)
 
+	#* Toggle with one real click at a time, letting Power BI apply each
+	#* toggle before the next so neither click gets dropped
+	for _ in range(1 if already_selected else 2):
+		was_selected = select_all.get_attribute("aria-selected")
+		click_and_wait(
+			select_all,
+			powerbi,
+			timeout=5000,
+			wait_until=_SELECTION_CHANGED,
+			wait_arg=[select_all.element_handle(), was_selected],
+		)
+
+	#* The share URL only carries the filter once Power BI has applied it
+	option = search_option(powerbi, dropdown, at="option", text_filter=team["ID"])
+	loader_attr, _ = POWERBI_DOM["active loader"]
 	click_and_wait(
-		search_option(powerbi, dropdown, at="option", text_filter=team["ID"]),
+		option,
 		powerbi,
+		timeout=30000,
+		wait_until=_FILTER_APPLIED,
+		wait_arg=[option.element_handle(), loader_attr],
 	)
 
 	url = powerbi_url()
@@ -262,11 +338,56 @@ def capture_powerbi_elements(team: pd.Series, save: bool = False) -> tuple[list[
 	return screenshots, url
 
 
+#* ---------------------------------------------------------------------------
+#* Shared account data
+#* ---------------------------------------------------------------------------
+
+def _account_keys() -> pd.Series:
+	"""
+	Return normalised, lowercased account names aligned with ACCOUNTS["data"].
+
+	ACCOUNTS["data"] is loaded once per run, so the keys are built on first
+	use and every later team only needs hash lookups against them.
+	"""
+	if ACCOUNTS["keys"] is None:
+		accounts = ACCOUNTS["data"][COLS["account"]].astype(str).str.strip()
+		ACCOUNTS["keys"] = accounts.str.normalize("NFKC").str.lower().str.strip()
+
+	return ACCOUNTS["keys"]
+
+
+def _account_dates() -> pd.Series:
+	"""
+	Return the parsed Date column of ACCOUNTS["data"].
+
+	Parsed on first use and reused for every team, instead of converting the
+	column again for each plot and overview.
+	"""
+	if ACCOUNTS["dates"] is None:
+		ACCOUNTS["dates"] = pd.to_datetime(ACCOUNTS["data"][COLS["date"]])
+
+	return ACCOUNTS["dates"]
+
+
+def _filter_accounts(frame: pd.DataFrame) -> pd.DataFrame:
+	"""
+	Keep the rows of frame whose account is listed in ACCOUNTS["filter"].
+
+	Args:
+		frame: Subset of ACCOUNTS["data"] that still carries its original index.
+
+	Returns:
+		The matching rows of frame.
+	"""
+	wanted = {str_normalize(account.lower().strip()) for account in ACCOUNTS["filter"]}
+	return frame[_account_keys().loc[frame.index].isin(wanted).to_numpy()]
+
+
 #* ---------------------------------------------------------------------------
 #* Progress plot
 #* ---------------------------------------------------------------------------
 
-def plot_ae_progress(team: pd.Series, show_datapoint_num: bool = False) -> list[IMG]:
+def plot_ae_progress(team: VTEAM, show_datapoint_num: bool = False) -> list[IMG]:
 	"""
 	Plot Copilot Chat MAU and Incremental MAU over time for the given team.
 
@@ -274,7 +395,7 @@ def plot_ae_progress(team: pd.Series, show_datapoint_num: bool = False) -> list[
 	then aggregates by date before plotting on a dual-axis line chart.
 
 	Args:
-		team:               Series row with "Role", "Names", and "ID".
+		team:               V-team row with "Role", "Names", and "ID".
 		show_datapoint_num: Annotate each data point with its value. Defaults to False.
 
 	Returns:
@@ -286,34 +407,31 @@ def plot_ae_progress(team: pd.Series, show_datapoint_num: bool = False) -> list[
 	if ACCOUNTS["data"] is None:
 		raise AccountsDataError()
 
-	df: pd.DataFrame = ACCOUNTS["data"].copy()
-	account_filter = (
-		[s.lower().strip() for s in ACCOUNTS["filter"]] if ACCOUNTS["filter"] else None
-	)
+	df: pd.DataFrame = ACCOUNTS["data"]
 
 	role = team["Role"]
 	names = team["Names"].replace(",", ", ")
 	log(f"Plotting account progress for {role}/s: {names}...", left_nl=1)
 
-	#* Narrow to this team's rows
-	progress = df[df[role] == team["ID"]].copy()
+	#* Narrow to this team's rows and the plotted columns; the shared frame is
+	#* only read, so it is never copied
+	progress = df.loc[df[role] == team["ID"], [COLS["adoption"], COLS["incremental"]]]
 
-	if account_filter:
-		progress[COLS["account"]] = progress[COLS["account"]].apply(
-			lambda x: str_normalize(str(x).strip())
-		)
-		progress = progress[
-			progress[COLS["account"]].str.lower().str.strip().isin(account_filter)
-		]
+	if ACCOUNTS["filter"]:
+		progress = _filter_accounts(progress)
 
-	progress[COLS["date"]]        = pd.to_datetime(progress[COLS["date"]])
-	progress[COLS["adoption"]]    = pd.to_numeric(progress[COLS["adoption"]])
-	progress[COLS["incremental"]] = pd.to_numeric(progress[COLS["incremental"]])
+	progress = progress.assign(**{
+		COLS["date"]:        _account_dates().loc[progress.index],
+		COLS["adoption"]:    pd.to_numeric(progress[COLS["adoption"]]),
+		COLS["incremental"]: pd.to_numeric(progress[COLS["incremental"]]),
+	})
 
 	progress = progress.groupby(COLS["date"]).agg(
 		{COLS["adoption"]: "sum", COLS["incremental"]: "sum"}
 	).reset_index()
 
+	#* A fresh figure per team keeps tight_layout and the twin axis from
+	#* inheriting anything from the previous team's plot
 	fig, ax1 = plt.subplots(figsize=(12, 6))
 	x = progress[COLS["date"]]
 
@@ -343,8 +461,9 @@ def plot_ae_progress(team: pd.Series, show_datapoint_num: bool = False) -> list[
 	ax1.legend(handles, labels, loc="upper center", bbox_to_anchor=(0.5, 1.15), ncol=2)
 	plt.tight_layout()
 
+	#* The PNG is decoded again straight away, so compressing it hard is wasted work
 	buf = io.BytesIO()
-	fig.savefig(buf, format="png")
+	fig.savefig(buf, format="png", pil_kwargs={"compress_level": _PNG_COMPRESS_LEVEL})
 	buf.seek(0)
 	plt.close(fig)
 
@@ -356,14 +475,26 @@ def plot_ae_progress(team: pd.Series, show_datapoint_num: bool = False) -> list[
 #* Filtered accounts view
 #* ---------------------------------------------------------------------------
 
-def filtered_accounts_overview(team: pd.Series) -> tuple[pd.DataFrame, IMG]:
+def _render_table() -> IMG:
+	"""
+	Render DF2IMG_OPTIONS["df"] as a table image.
+
+	The table is rendered at 1x: crop_pic scales it down to 850px anyway,
+	and 1000px still leaves room for the crop, so a 2x render only
+	quadrupled the pixels kaleido and the crop had to process.
+	"""
+	fig = df2img.plot_dataframe(**DF2IMG_OPTIONS)
+	return Image.open(io.BytesIO(fig.to_image(format="png", width=1000, height=500, scale=1)))
+
+
+def filtered_accounts_overview(team: VTEAM) -> tuple[pd.DataFrame, IMG]:
 	"""
 	Render the most-recent snapshot for the team's accounts as a table image.
 
 	Applies the active account filter (ACCOUNTS["filter"]) when set.
 
 	Args:
-		team: Series row with at least an "ID" field.
+		team: V-team row with at least an "ID" field.
 
 	Returns:
 		Tuple of (filtered_dataframe, cropped_table_image).
@@ -374,14 +505,15 @@ def filtered_accounts_overview(team: pd.Series) -> tuple[pd.DataFrame, IMG]:
 	if ACCOUNTS["data"] is None:
 		raise AccountsDataError()
 
-	df = ACCOUNTS["data"].copy()
-	df[COLS["date"]] = pd.to_datetime(df[COLS["date"]])
+	df    = ACCOUNTS["data"]
+	dates = _account_dates()
 
 	ae_id     = team["ID"]
-	last_date = df[COLS["date"]].max()
+	last_date = dates.max()
 
-	#* Restrict to this AE's rows for the most recent date only
-	ae_df = df.loc[(df["AE"] == ae_id) & (df[COLS["date"]] == last_date)].copy()
+	#* Restrict to this AE's rows for the most recent date only; only that
+	#* slice is copied, not the whole accounts frame
+	ae_df = df.loc[(df["AE"] == ae_id) & (dates == last_date)].copy()
 
 	#* Determine which columns should be summed vs averaged/percent
 	excluded_from_sum = set(COLTYPES["text"] + COLTYPES["avg"] + [COLS["date"]])
@@ -393,22 +525,15 @@ def filtered_accounts_overview(team: pd.Series) -> tuple[pd.DataFrame, IMG]:
 	DF2IMG_OPTIONS["df"] = ae_df.drop(columns=[COLS["date"], "AE"])
 
 	if ACCOUNTS["filter"]:
-		account_filter = [str_normalize(s.lower().strip()) for s in ACCOUNTS["filter"]]
-		filtered = DF2IMG_OPTIONS["df"].copy()
-		filtered[COLS["account"]] = filtered[COLS["account"]].apply(
-			lambda x: str_normalize(str(x).strip())
-		)
-		DF2IMG_OPTIONS["df"] = filtered[
-			filtered[COLS["account"]].str.lower().str.strip().isin(account_filter)
-		]
-
-	fig = df2img.plot_dataframe(**DF2IMG_OPTIONS)
-	img = Image.open(io.BytesIO(fig.to_image(format="png", width=1000, height=500, scale=2)))
+		filtered = _filter_accounts(DF2IMG_OPTIONS["df"])
+		DF2IMG_OPTIONS["df"] = filtered.assign(**{
+			COLS["account"]: filtered[COLS["account"]].astype(str).str.strip().str.normalize("NFKC")
+		})
 
-	return DF2IMG_OPTIONS["df"], crop_pic(img)
+	return DF2IMG_OPTIONS["df"], crop_pic(_render_table())
 
 
-def filtered_accounts(team: pd.Series) -> list[IMG]:
+def filtered_accounts(team: VTEAM) -> list[IMG]:
 	"""
 	Build a stacked image of the accounts overview and a totals summary table.
 
@@ -416,7 +541,7 @@ def filtered_accounts(team: pd.Series) -> list[IMG]:
 	formats percentage columns, and stacks the overview image above the totals.
 
 	Args:
-		team: Series row passed through to filtered_accounts_overview.
+		team: V-team row passed through to filtered_accounts_overview.
 
 	Returns:
 		Single-element list with the stacked IMG.
@@ -424,31 +549,26 @@ def filtered_accounts(team: pd.Series) -> list[IMG]:
 	log("Generating filtered accounts view...", left_nl=1)
 
 	df, overview_pic = filtered_accounts_overview(team)
-	totals_df = df.copy()
 
 	avg_cols  = COLTYPES["avg"]
 	sum_cols  = COLTYPES["sum"]
 	pct_cols  = set(COLTYPES["%"])
 
-	#* Convert percentage strings and plain floats to numeric for aggregation
-	for col in avg_cols:
-		if col in pct_cols:
-			totals_df[col] = totals_df[col].str.rstrip("%").astype(float) / 100
-		else:
-			totals_df[col] = totals_df[col].astype(float) / 100
+	#* Convert percentage strings and plain floats to numeric for aggregation;
+	#* the % signs are stripped from every percentage column in one replace and
+	#* all averages are scaled in one division, without copying the whole frame
+	averages = df[avg_cols]
+	pct_avg  = [col for col in avg_cols if col in pct_cols]
+	if pct_avg:
+		averages = averages.assign(**averages[pct_avg].replace(r"%+$", "", regex=True))
+	averages = averages.astype(float) / 100
 
 	#* Build the single-row totals DataFrame from aggregated values
-	totals = pd.DataFrame({
-		**{col: [totals_df[col].mean()] for col in avg_cols},
-		**{col: [totals_df[col].sum()]  for col in sum_cols},
-	})
+	totals = pd.DataFrame([{**averages.mean().to_dict(), **df[sum_cols].sum().to_dict()}])
 
 	#* Re-format percentage columns as readable strings
 	for col in pct_cols:
 		totals[col] = totals[col].apply(lambda x: f"{x * 100:.1f}%")
 
 	DF2IMG_OPTIONS["df"] = totals
-	fig = df2img.plot_dataframe(**DF2IMG_OPTIONS)
-	summary_img = Image.open(io.BytesIO(fig.to_image(format="png", width=1000, height=500, scale=2)))
-
-	return [stack_images_vertically(overview_pic, crop_pic(summary_img))]
+	return [stack_images_vertically(overview_pic, crop_pic(_render_table()))]
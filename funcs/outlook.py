@@ -1,14 +1,16 @@
-from .page import wait_for, click_and_wait
-from .media import img_to_b64, imgs_to_b64
+from .page import ELEMENT_GONE, wait_for, click_and_wait, settle
+from .media import shared_img_to_b64, imgs_to_b64
 from .logs import log, mail_log
 from .imports import Locator
 from vars.exports import (
 	INCENTIVES_SLIDE_PATH,
+	COMPOSE_LOCATORS,
 	MEDIA_LABELS,
 	OUTLOOK_DOM,
 	MAIL_LOGS,
 	PAGES,
 	MEDIA,
+	Page,
 	IMG,
 	pd,
 )
@@ -41,7 +43,29 @@ def _outlook():
 	return PAGES["outlook"]
 
 
-def mail_attach_image(body: Locator, pic: str, wait_time: int = 500) -> None:
+_BULLET_STATE = "() => document.queryCommandState('insertUnorderedList')"
+
+#* The recipient field is a combobox: it flags its popup as expanded and
+#* points at it through aria-controls, which keeps the probe off other
+#* listboxes on the page such as the message list
+_SUGGESTIONS_SHOWN = """([el, option]) => {
+	const box = el.closest("[aria-controls]") || el;
+	const popup = document.getElementById(box.getAttribute("aria-controls"));
+	return box.getAttribute("aria-expanded") === "true"
+		&& popup !== null
+		&& popup.querySelector(option) !== null;
+}"""
+
+#* A pasted image keeps a data:/blob: source until Outlook has uploaded it
+#* and swapped in the attachment's URL
+_IMAGE_COUNT  = "el => el.querySelectorAll('img').length"
+_IMAGE_PASTED = "([el, n]) => el.querySelectorAll('img').length > n"
+_IMAGES_READY = """el => Array.from(el.querySelectorAll('img')).every(
+	img => img.complete && img.naturalWidth > 0 && !/^(data|blob):/.test(img.src)
+)"""
+
+
+def mail_attach_image(body: Locator, pic: str, wait_time: int = 5000) -> None:
 	"""
 	Paste a base64-encoded PNG into the Outlook email body via a synthetic ClipboardEvent.
 
@@ -51,19 +75,23 @@ def mail_attach_image(body: Locator, pic: str, wait_time: int = 500) -> None:
 	Args:
 		body:      Locator for the compose body element.
 		pic:       Base64-encoded PNG string.
-		wait_time: Milliseconds to wait after the paste event settles. Defaults to 500.
+		wait_time: Max milliseconds to wait for the image to show up in the body.
+						Defaults to 5000.
 	"""
 	log("Attaching image...")
 
 	outlook = _outlook()
+	images_before = body.evaluate(_IMAGE_COUNT)
 	outlook.keyboard.press(" ")
 	outlook.keyboard.press("Enter")
 
 	#* Inject the image by constructing a DataTransfer and firing a paste event —
-	#* Outlook's compose window does not expose a native file-input for inline images
+	#* Outlook's compose window does not expose a native file-input for inline images.
+	#* The promise is returned so the call only resolves once the paste was dispatched,
+	#* leaving wait_time to cover Outlook inserting the image rather than the decode
 	body.evaluate(
 		"""(el, base64) => {
-			fetch(`data:image/png;base64,${base64}`)
+			return fetch(`data:image/png;base64,${base64}`)
 					.then(res => res.blob())
 					.then(blob => {
 						const file = new File([blob], "pic.png", { type: "image/png" });
@@ -82,7 +110,7 @@ def mail_attach_image(body: Locator, pic: str, wait_time: int = 500) -> None:
 		pic,
 	)
 
-	outlook.wait_for_timeout(wait_time)
+	settle(outlook, _IMAGE_PASTED, [body.element_handle(), images_before], timeout=wait_time)
 	outlook.keyboard.press("Enter")
 
 
@@ -126,12 +154,22 @@ def add_emails(field: Locator, emails: list[str], is_to: bool = True) -> None:
 
 	outlook = _outlook()
 	field.click()
+	suggestion, _ = OUTLOOK_DOM["suggestion"]
+	handle = field.element_handle()
 
 	for email in emails:
 		outlook.keyboard.type(email)
-		outlook.wait_for_timeout(500)
+
+		#* Move on once this field's own suggestion popup lists an address
+		settle(outlook, _SUGGESTIONS_SHOWN, [handle, suggestion])
 		outlook.keyboard.press(";")
-		outlook.wait_for_timeout(500)
+
+		#* Move on once the typed address has been turned into a recipient
+		settle(
+			outlook,
+			"([el, email]) => !el.innerText.includes(email)",
+			[handle, email],
+		)
 
 
 def check_bullets(cmd: str, is_bulleted: bool) -> bool:
@@ -161,8 +199,11 @@ def check_bullets(cmd: str, is_bulleted: bool) -> bool:
 
 	if "bullet" not in cmd and is_bulleted:
 		for _ in range(_REPEAT):
+			was_bulleted = outlook.evaluate(_BULLET_STATE)
 			outlook.keyboard.press("Control+.")
-			outlook.wait_for_timeout(500)
+
+			#* Move on once the editor reports the list state has flipped
+			settle(outlook, f"was => ({_BULLET_STATE})() !== was", was_bulleted)
 		return False
 
 	return is_bulleted
@@ -216,14 +257,15 @@ def _resolve_visual(visual_id: str, pics: list[str]) -> str:
 	Raises:
 		MissingVisualError: If the ID cannot be resolved by any of the above.
 	"""
+	#* Shared visuals are the same for every mail, so they are encoded once per run
 	if visual_id in MEDIA:
-		return img_to_b64(MEDIA[visual_id])
+		return shared_img_to_b64(visual_id, MEDIA[visual_id])
 
 	if visual_id in MEDIA_LABELS:
 		return pics[MEDIA_LABELS[visual_id]]
 
 	if visual_id == "incentives":
-		return img_to_b64(INCENTIVES_SLIDE_PATH)
+		return shared_img_to_b64(visual_id, INCENTIVES_SLIDE_PATH)
 
 	raise MissingVisualError(visual_id)
 
@@ -232,6 +274,35 @@ def _resolve_visual(visual_id: str, pics: list[str]) -> str:
 #* Mail composition
 #* ---------------------------------------------------------------------------
 
+def _compose_locators(outlook: Page, reader: Locator) -> tuple[Locator, dict[str, Locator]]:
+	"""
+	Return the Send button and the input fields of the Outlook compose window.
+
+	Every new mail opens the same compose layout, and Playwright locators are
+	lazy selectors that re-resolve on use, so the fields are only located with
+	wait_for for the first mail on a page and reused afterwards. Clicking them
+	still auto-waits for the new compose window's elements.
+
+	Args:
+		outlook: The Outlook page the compose window belongs to.
+		reader:  Locator for the compose reader pane.
+	"""
+	if COMPOSE_LOCATORS.get("page") is not outlook:
+		field_key = "field"
+		COMPOSE_LOCATORS.update({
+			"page": outlook,
+			"send": wait_for(reader, OUTLOOK_DOM, at=["send"])[0],
+			"fields": {
+				"subject": wait_for(reader, OUTLOOK_DOM, at=["subject"])[0],
+				"to":      wait_for(reader, OUTLOOK_DOM, at=[field_key], index={field_key: 0})[0],
+				"cc":      wait_for(reader, OUTLOOK_DOM, at=[field_key], index={field_key: 1})[0],
+				"body":    wait_for(reader, OUTLOOK_DOM, at=[field_key], index={field_key: 2})[0],
+			},
+		})
+
+	return COMPOSE_LOCATORS["send"], COMPOSE_LOCATORS["fields"]
+
+
 def compose_mail(
 	mail_structure: pd.DataFrame,
 	pics: list[str] | None = None,
@@ -277,16 +348,7 @@ def compose_mail(
 	outlook = _outlook()
 
 	reader = wait_for(outlook, OUTLOOK_DOM, at=["reader"])[0]
-	send   = wait_for(reader,  OUTLOOK_DOM, at=["send"])[0]
-
-	#* Locate all interactive fields up front to avoid repeated DOM queries
-	field_key = "field"
-	fields: dict[str, Locator] = {
-		"subject": wait_for(reader, OUTLOOK_DOM, at=["subject"])[0],
-		"to":      wait_for(reader, OUTLOOK_DOM, at=[field_key], index={field_key: 0})[0],
-		"cc":      wait_for(reader, OUTLOOK_DOM, at=[field_key], index={field_key: 1})[0],
-		"body":    wait_for(reader, OUTLOOK_DOM, at=[field_key], index={field_key: 2})[0],
-	}
+	send, fields = _compose_locators(outlook, reader)
 
 	add_emails(fields["to"], to)
 	add_emails(fields["cc"], cc, is_to=False)
@@ -294,11 +356,12 @@ def compose_mail(
 	fields["body"].click()
 	is_bulleted = False
 
-	for _, row in mail_structure.iterrows():
-		cmd_original: str = row["Command"]
-		cmd:          str = cmd_original.lower()
-		text:         str = row["Text"]
-		is_end:       bool = "end" in cmd
+	#* Plain tuples avoid boxing every structure row into a Series
+	rows = mail_structure[["Command", "Text"]].itertuples(index=False, name=None)
+
+	for cmd_original, text in rows:
+		cmd:    str  = cmd_original.lower()
+		is_end: bool = "end" in cmd
 
 		#* Subject is filled once and control returns to the body immediately
 		if "subject" in cmd:
@@ -343,7 +406,7 @@ def compose_mail(
 						outlook.keyboard.press("Enter")
 
 				bold(title, wait_time=1000)
-				mail_attach_image(fields["body"], pic, wait_time=1000)
+				mail_attach_image(fields["body"], pic)
 				outlook.keyboard.press("Enter")
 				prev_group = group
 
@@ -366,6 +429,10 @@ def compose_mail(
 		outlook.wait_for_timeout(500)
 		outlook.keyboard.press("Enter")
 
+	#* Inline images upload in the background; sending before they finish
+	#* would drop them from the mail
+	settle(outlook, _IMAGES_READY, fields["body"].element_handle(), timeout=30000)
+
 	return send
 
 
@@ -417,7 +484,15 @@ def send_new_mail(
 		collected_pics=collected_pics,
 	)
 
-	click_and_wait(send, outlook, timeout=2000)
+	#* Sending is done once Outlook has closed the compose form
+	send_attr, _ = OUTLOOK_DOM["send"]
+	click_and_wait(
+		send,
+		outlook,
+		timeout=10000,
+		wait_until=ELEMENT_GONE,
+		wait_arg=send_attr,
+	)
 
 	log(f"Mail sent to {names}.")
 	log(mail_log(to, cc, role), type=MAIL_LOGS, silent=True)
@@ -1,8 +1,9 @@
-from .str_actions import str_normalize, strip_edges
-from .imports import Locator
+from .imports import PlaywrightTimeoutError, monotonic, Any, Locator
 from .logs import log
 from vars.exports import (
 	SHAREPOINT_DOM,
+	WATCHED_PAGES,
+	LOCATOR_CACHE,
 	POWERBI_DOM,
 	FINDER,
 	PAGES,
@@ -28,6 +29,13 @@ class PowerBIUrlError(RuntimeError):
 		super().__init__("Power BI share dialog returned an empty URL.")
 
 
+class SharePointPasteError(RuntimeError):
+	"""Raised when pasted text does not show up in the SharePoint editor."""
+
+	def __init__(self, timeout: int) -> None:
+		super().__init__(f"Paste did not reach the SharePoint editor within {timeout} ms.")
+
+
 class DropdownOptionNotFoundError(LookupError):
 	"""Raised when a searched option is not found within a dropdown."""
 
@@ -39,56 +47,229 @@ class DropdownOptionNotFoundError(LookupError):
 #* Click helpers
 #* ---------------------------------------------------------------------------
 
+#* Predicate for settle/wait_until: holds once nothing matches the selector
+ELEMENT_GONE = "selector => !document.querySelector(selector)"
+
+
+def settle(page: Page, expression: str, arg: Any = None, timeout: int = 500) -> None:
+	"""
+	Wait until a JS predicate holds in the page, for at most timeout milliseconds.
+
+	Stands in for a fixed sleep of the same length: the wait ends as soon as
+	the page has caught up, and never takes longer than the sleep it replaces.
+
+	Args:
+		page:       Page to evaluate the predicate in.
+		expression: JS function evaluated repeatedly until it returns a truthy value.
+		arg:        Argument passed to expression. Defaults to None.
+		timeout:    Upper bound in milliseconds. Defaults to 500.
+	"""
+	try:
+		page.wait_for_function(expression, arg=arg, timeout=timeout)
+	except PlaywrightTimeoutError:
+		pass
+
+
 def click_and_wait(
 	element: Locator,
 	page: Page,
 	timeout: int = 500,
 	render_time: int = 30000,
 	clicks: int = 1,
+	wait_until: Locator | str | None = None,
+	wait_arg: Any = None,
 ) -> None:
 	"""
 	Ensure element is ready, then click it one or more times.
 
-	Waits for the element to be attached and visible before the first click,
-	and pauses for timeout milliseconds between every click and after the last.
+	Waits for the element to be attached and visible before the first click;
+	each click relies on Playwright's own actionability checks rather than a
+	fixed pause. When the click has an effect worth waiting for, pass it as
+	wait_until and it is awaited for at most timeout milliseconds.
 
 	Args:
 		element:     Locator to interact with.
-		page:        Page the element belongs to, used for timeout waits.
-		timeout:     Milliseconds to wait before each click and after the last. Defaults to 500.
+		page:        Page the element belongs to, used for the settle wait.
+		timeout:     Max milliseconds to wait for wait_until. Defaults to 500.
 		render_time: Maximum milliseconds to wait for attach/visible state. Defaults to 30000.
 		clicks:      Number of times to click. Defaults to 1.
+		wait_until:  Locator to become visible, or JS predicate to hold,
+						after the last click. Defaults to None (no wait).
+		wait_arg:    Argument passed to a JS wait_until predicate. Defaults to None.
 	"""
 	element.wait_for(state="attached", timeout=render_time)
 	element.scroll_into_view_if_needed()
 	element.wait_for(state="visible", timeout=render_time)
-	page.wait_for_timeout(timeout)
+
+	#* Log only the selector chain from the Locator's repr: it is built locally,
+	#* so there is no round-trip to the page, and the frame URL is left out
+	label, _, selector = repr(element).partition(" selector=")
+	label = selector.removesuffix(">") or label
+	log(f"Clicking element: {label}" + (f" ({clicks}x)" if clicks > 1 else ""))
 
 	for _ in range(clicks):
-		page.wait_for_timeout(timeout)
-
-		#* Build a human-readable CSS selector from the element's tag, id, and
-		#* class list so the log line is meaningful without needing DevTools
-		selector = page.evaluate(
-			"""el =>
-					el.tagName.toLowerCase()
-					+ (el.id ? '#*' + el.id : '')
-					+ (!el.id && el.className
-						? '.' + el.className.split(' ').join('.')
-						: '')
-			""",
-			element.element_handle(),
-		)
-		log(f"Clicking element: {selector}")
 		element.click()
 
-	page.wait_for_timeout(timeout)
+	if isinstance(wait_until, Locator):
+		try:
+			wait_until.wait_for(state="visible", timeout=timeout)
+		except PlaywrightTimeoutError:
+			pass
+	elif wait_until:
+		settle(page, wait_until, wait_arg, timeout=timeout)
 
 
 #* ---------------------------------------------------------------------------
 #* Element location
 #* ---------------------------------------------------------------------------
 
+_LOCATOR_TTL = 2.0
+
+#* Only the first attempt gets the caller's full timeout; retries are capped
+#* so a missing element fails in well under five full timeouts
+_RETRY_TIMEOUT = 5000
+
+#* A page has settled once it has loaded and no Power BI spinner is showing;
+#* pages without that spinner only need to have finished loading
+_LOADER_ATTR, _ = POWERBI_DOM["active loader"]
+_PAGE_SETTLED = "loader => document.readyState === 'complete' && !document.querySelector(loader)"
+
+
+def _watch_navigation(page: Page) -> None:
+	"""Clear the locator cache whenever page navigates, registering the hook only once."""
+	if id(page) in WATCHED_PAGES:
+		return
+
+	page.on("framenavigated", lambda _: LOCATOR_CACHE.clear())
+	WATCHED_PAGES.add(id(page))
+
+
+def _cached_locator(key: tuple) -> Locator | None:
+	"""
+	Return the Locator cached under key if it is recent and still visible.
+
+	The visibility probe does not wait, so a stale entry costs a single
+	round-trip before wait_for falls back to locating the element again.
+	"""
+	cached = LOCATOR_CACHE.get(key)
+	if cached is None:
+		return None
+
+	locator, stored_at = cached
+	if monotonic() - stored_at < _LOCATOR_TTL and locator.is_visible():
+		return locator
+
+	del LOCATOR_CACHE[key]
+	return None
+
+
+def _resolve_one(
+	container: Page | Locator,
+	dom_attr: FINDER,
+	name: str,
+	dynamic: str | None,
+	i: int,
+	strict: bool,
+	timeout: int,
+) -> Locator:
+	"""
+	Locate a single named element, retrying up to 5 times.
+
+	Args:
+		container: Page or Locator to search within.
+		dom_attr:  Mapping of element names to (selector, text_filter) tuples.
+		name:      Name of the element to locate.
+		dynamic:   Value substituted for the "*attr*" placeholder, if any.
+		i:         Positional index; -1 selects the last element.
+		strict:    Confirm visible before returning.
+		timeout:   Max milliseconds to wait on the first attempt; retries are
+						capped at _RETRY_TIMEOUT.
+
+	Raises:
+		ElementNotFoundError: If the element cannot be located after 5 attempts.
+	"""
+	attr, text_filter = dom_attr[name]
+
+	#* Reuse an element confirmed visible moments ago if it still is. Pages live
+	#* for the whole run, but Locator containers are short-lived and their id()
+	#* gets reused, so those are keyed on their selector instead
+	scope = id(container) if isinstance(container, Page) else str(container)
+	key = (scope, id(dom_attr), name, dynamic, i)
+	if strict and (cached := _cached_locator(key)):
+		return cached
+
+	#* Substitute the dynamic placeholder and build the locator once —
+	#* locators are lazy, so every retry can reuse the same one
+	if dynamic is not None:
+		attr = attr.replace("*attr*", dynamic)
+
+	element = container.locator(attr)
+	if text_filter:
+		element = element.filter(has_text=text_filter)
+
+	selected = (element.last if i == -1 else element.nth(i)) if strict else element
+
+	for attempt in range(5):
+		try:
+			if strict:
+				#* A visible element is necessarily attached, so one wait covers both
+				wait = timeout if attempt == 0 else min(timeout, _RETRY_TIMEOUT)
+				selected.wait_for(state="visible", timeout=wait)
+				selected.scroll_into_view_if_needed()
+
+			log(f'Element "{attr}" located.')
+
+			if strict:
+				_watch_navigation(container if isinstance(container, Page) else container.page)
+				LOCATOR_CACHE[key] = (selected, monotonic())
+			return selected
+
+		except (TimeoutError, PlaywrightTimeoutError):
+			if attempt == 4:
+				raise ElementNotFoundError(attr)
+
+			log(f'Failed to locate "{attr}" — attempt {attempt + 1}/5, retrying...')
+
+			#* Retry as soon as the page has settled rather than after a fixed second
+			if isinstance(container, Page):
+				settle(container, _PAGE_SETTLED, _LOADER_ATTR, timeout=1000)
+
+	raise ElementNotFoundError(attr)
+
+
+def wait_for_one(
+	container: Page | Locator,
+	dom_attr: FINDER,
+	name: str,
+	timeout: int = 60000,
+	dynamic: str | None = None,
+	index: int = 0,
+	strict: bool = True,
+) -> Locator:
+	"""
+	Locate a single DOM element by name; the one-element form of wait_for.
+
+	Args:
+		container: Page or Locator to search within.
+		dom_attr:  Mapping of element names to (selector, text_filter) tuples.
+		name:      Name of the element to locate.
+		timeout:   Max milliseconds to wait for the element. Defaults to 60000.
+		dynamic:   Value substituted for the "*attr*" placeholder. Defaults to None.
+		index:     0-based positional index; -1 selects the last element. Defaults to 0.
+		strict:    Confirm visible before returning. Defaults to True.
+
+	Returns:
+		Locator for the named element.
+
+	Raises:
+		ElementNotFoundError: If the element cannot be located after 5 attempts.
+	"""
+	if not strict and isinstance(container, Locator):
+		container.scroll_into_view_if_needed()
+
+	return _resolve_one(container, dom_attr, name, dynamic, index, strict, timeout)
+
+
 def wait_for(
 	container: Page | Locator,
 	dom_attr: FINDER,
@@ -104,7 +285,7 @@ def wait_for(
 
 	Elements are identified by name via dom_attr, which maps each name to a
 	(selector, text_filter) tuple. When strict=True each element is confirmed
-	attached and visible before being returned.
+	visible and scrolled into view before being returned.
 
 	Args:
 		container: Page or Locator to search within.
@@ -116,7 +297,7 @@ def wait_for(
 						in selectors before locating.
 		index:     Name → positional index for nth-element selection;
 						0-based, -1 selects the last element. Defaults to 0 for all.
-		strict:    Confirm attached + visible before returning. Defaults to True.
+		strict:    Confirm visible before returning. Defaults to True.
 
 	Returns:
 		Ordered list of Locators matching the requested names.
@@ -125,57 +306,20 @@ def wait_for(
 		ElementNotFoundError: If any element cannot be located after 5 attempts.
 	"""
 	skip = skip or []
+	dynamic = dynamic or {}
+	index = index or {}
 
-	if isinstance(container, Locator):
+	#* Strict lookups scroll the selected element into view, which brings its
+	#* container along, so the container only needs scrolling on its own here
+	if not strict and isinstance(container, Locator):
 		container.scroll_into_view_if_needed()
 
-	#* Build the working set — either a subset defined by `at` or the full map
-	entities: dict = {name: dom_attr[name] for name in at} if at else dict(dom_attr)
-
-	#* Substitute dynamic placeholders in selectors before locating
-	if dynamic:
-		for name, dyn_value in dynamic.items():
-			if name in entities:
-				attr, text_filter = entities[name]
-				entities[name] = (attr.replace("*attr*", dyn_value), text_filter)
-
-	elements: list[Locator] = []
-
-	for name, (attr, text_filter) in entities.items():
-		if name in skip:
-			continue
-
-		for attempt in range(5):
-			try:
-				element = container.locator(attr)
-
-				if text_filter:
-					element = element.filter(has_text=text_filter)
-
-				if strict:
-					#* Resolve to a single element using the provided index (default: first)
-					i = 0 if index is None else index.get(name, 0)
-					selected = element.last if i == -1 else element.nth(i)
-
-					selected.wait_for(state="attached", timeout=timeout)
-					selected.scroll_into_view_if_needed()
-					selected.wait_for(state="visible", timeout=timeout)
-				else:
-					selected = element
-
-				log(f'Element "{attr}" located.')
-				elements.append(selected)
-				break
-
-			except TimeoutError:
-				if attempt == 4:
-					raise ElementNotFoundError(attr)
-
-				log(f'Failed to locate "{attr}" — attempt {attempt + 1}/5, retrying...')
-				if isinstance(container, Page):
-					container.wait_for_timeout(1000)
-
-	return elements
+	#* Walk either the subset defined by `at` or the full map, without copying it
+	return [
+		_resolve_one(container, dom_attr, name, dynamic.get(name), index.get(name, 0), strict, timeout)
+		for name in at or dom_attr
+		if name not in skip
+	]
 
 
 #* ---------------------------------------------------------------------------
@@ -201,14 +345,22 @@ def powerbi_url() -> str:
 	powerbi = PAGES["powerbi"]
 
 	#* The URL is surfaced through two nested dialogs: share → url copy field
-	click_and_wait(wait_for(powerbi, POWERBI_DOM, at=["share"])[0], powerbi)
-	click_and_wait(wait_for(powerbi, POWERBI_DOM, at=["url"])[0],   powerbi)
+	click_and_wait(wait_for_one(powerbi, POWERBI_DOM, "share"), powerbi)
+	click_and_wait(wait_for_one(powerbi, POWERBI_DOM, "url"),   powerbi)
 
-	copy_url = wait_for(powerbi, POWERBI_DOM, at=["copy url"])[0]
-	url = copy_url.get_attribute("aria-label")
+	#* get_attribute already waits for the field to be attached, and reading it
+	#* needs neither scrolling nor visibility — one round-trip instead of four
+	copy_url_attr, _ = POWERBI_DOM["copy url"]
+	url = powerbi.locator(copy_url_attr).first.get_attribute("aria-label")
 
 	#* Close the dialog regardless of whether the URL was found
-	click_and_wait(wait_for(powerbi, POWERBI_DOM, at=["close url"])[0], powerbi)
+	click_and_wait(
+		wait_for_one(powerbi, POWERBI_DOM, "close url"),
+		powerbi,
+		timeout=5000,
+		wait_until=ELEMENT_GONE,
+		wait_arg=copy_url_attr,
+	)
 
 	if not url:
 		raise PowerBIUrlError()
@@ -224,11 +376,12 @@ def search_option(
 	go_down: bool = True,
 ) -> Locator:
 	"""
-	Keyboard-navigate a Power BI dropdown until the target option is visible.
+	Find the target option in a Power BI dropdown, scrolling to it if needed.
 
-	Presses ArrowDown (or ArrowUp when go_down=False) repeatedly, comparing
-	the last focused element after each press to detect when the list wraps
-	without finding the target.
+	When the option is already rendered it is scrolled into view directly.
+	Otherwise the dropdown is virtualised, so ArrowDown (or ArrowUp when
+	go_down=False) is pressed until the option renders; if the focused
+	option stops changing the end of the list was reached without a match.
 
 	Args:
 		powerbi:     Page driving the keyboard events.
@@ -241,49 +394,98 @@ def search_option(
 		Locator for the matching option element.
 
 	Raises:
-		DropdownOptionNotFoundError: If the list wraps without a match.
+		DropdownOptionNotFoundError: If the list ends without a match.
 	"""
+	option_attr, _ = POWERBI_DOM[at]
+	option_attr = option_attr.replace("*attr*", text_filter)
+	outline_attr, _ = POWERBI_DOM["option outline"]
+
+	#* Fast path — the option is rendered, so jump straight to it
+	option = dropdown.locator(option_attr).first
+	if option.count():
+		option.scroll_into_view_if_needed()
+		return option
+
 	direction = "ArrowDown" if go_down else "ArrowUp"
 
 	#* Prime the dropdown so it registers keyboard focus
 	powerbi.keyboard.press("ArrowDown")
 
-	outline_attr, _ = POWERBI_DOM["option outline"]
-	prev_el = dropdown.locator(outline_attr).last
-
-	while text_filter not in str_normalize(dropdown.inner_text()):
+	#* Each step only brings back whether the option exists and the focused
+	#* option's text, rather than the whole dropdown's text
+	probe = """(el, { option, outline }) => {
+		const rings = el.querySelectorAll(outline);
+		return {
+			found: el.querySelector(option) !== null,
+			focus: rings.length ? rings[rings.length - 1].textContent : null,
+		};
+	}"""
+	moved = f"""([el, args, prev]) => {{
+		const state = ({probe})(el, args);
+		return state.found || state.focus !== prev;
+	}}"""
+	args = {"option": option_attr, "outline": outline_attr}
+	handle = dropdown.element_handle()
+	state = dropdown.evaluate(probe, args)
+
+	while not state["found"]:
+		prev_focus = state["focus"]
 		powerbi.keyboard.press(direction)
-		current_el = dropdown.locator(outline_attr).last
 
-		#* If the focused element did not change the list has wrapped — give up
-		if current_el == prev_el:
+		#* The focus ring re-renders asynchronously, so give it time to move
+		#* before reading where it ended up
+		settle(powerbi, moved, [handle, args, prev_focus], timeout=1000)
+		state = dropdown.evaluate(probe, args)
+
+		#* If the focused option still did not change the list has ended — give up
+		if not state["found"] and state["focus"] == prev_focus:
 			raise DropdownOptionNotFoundError(text_filter)
 
-		prev_el = current_el
+	#* The probe just saw the option and keyboard navigation already scrolled
+	#* to it, so only attachment is left to confirm before handing it back
+	option.wait_for(state="attached")
+	return option
+
+
+POWERBI_ROW_SEP = "Select Row"
+
+
+#* Shared by extract_row and scroll_inner_texts: the browser-side equivalent of
+#* str_normalize and str.split, trimming the text and removing edge from both
+#* of its ends first when it is not null
+_SPLIT_TEXT_JS = """(text, sep, edge) => {
+	text = text.normalize("NFKC");
 
-	return wait_for(
-		dropdown,
-		at=[at],
-		dom_attr=POWERBI_DOM,
-		dynamic={at: text_filter},
-	)[0]
+	if (edge !== null) {
+		text = text.trim();
+		if (text.startsWith(edge)) text = text.slice(edge.length);
+		if (text.endsWith(edge)) text = text.slice(0, -edge.length);
+	}
 
+	return text.split(sep);
+}"""
 
-def powerbi_row(row: Locator) -> list[str]:
+
+def extract_row(row: Locator, sep: str, edge: str | None = None) -> list[str]:
 	"""
-	Split a Power BI data row's text into individual cell values.
+	Normalise a row element's text and split it on sep, all in the browser.
 
-	Power BI renders each row with "Select Row" as a separator between cells;
-	strip_edges removes any leading/trailing occurrence before splitting.
+	Runs the str_normalize and str.split equivalent in the page, so only the
+	split values cross over from it.
 
 	Args:
-		row: Locator for the row element.
+		row:  Locator for the row element.
+		sep:  Separator to split the text on.
+		edge: When given, the text is trimmed and edge removed from both of
+				its ends before splitting. Defaults to None.
 
 	Returns:
-		List of cell text strings.
+		List of the split text values.
 	"""
-	sep = "Select Row"
-	return strip_edges(str_normalize(row.inner_text()).strip(), sep).split(sep)
+	return row.evaluate(
+		f"(el, {{ sep, edge }}) => ({_SPLIT_TEXT_JS})(el.innerText, sep, edge)",
+		{"sep": sep, "edge": edge},
+	)
 
 
 def powerbi_headers(row: Locator) -> list[str]:
@@ -299,24 +501,99 @@ def powerbi_headers(row: Locator) -> list[str]:
 	Returns:
 		Non-empty header title strings in column order.
 	"""
-	sep = "Row Selection\n"
-	header = strip_edges(str_normalize(row.inner_text()).strip(), sep).split("\n")
-	return [title.strip() for title in header if title.strip()]
+	header = extract_row(row, "\n", edge="Row Selection\n")
+	return [title for line in header if (title := line.strip())]
 
 
-def is_locator_scrolled_to_bottom(container: Locator) -> bool:
+def scroll_inner_texts(
+	container: Locator,
+	row_selector: str,
+	index_attr: str,
+	wait_time: int = 500,
+	timeout: int = 60000,
+	sep: str | None = None,
+) -> tuple[list[str], bool]:
 	"""
-	Return True if the container's scroll position has reached the bottom.
+	Scroll a virtualised list to the bottom, capturing its inner text at every step.
+
+	The whole loop runs in the browser within a single evaluate call. At each
+	step it waits for the row whose index_attr matches the last row rendered
+	before the previous scroll, reads the container's inner text, then scrolls
+	down by a third of the viewport so no row is skipped at the boundary.
 
-	Uses scrollTop + clientHeight >= scrollHeight, which matches the browser's
-	own definition of "scrolled to bottom" (accounting for sub-pixel rounding).
+	When sep is given, each step's text is normalised and split into rows
+	in the browser the same way extract_row does, and every row is returned
+	once. Consecutive windows overlap, so this avoids sending each row back
+	several times.
 
 	Args:
-		container: Locator for the scrollable element.
+		container:    Locator for the scrollable list element.
+		row_selector: CSS selector matching a rendered row.
+		index_attr:   Attribute holding a row's position in the list.
+		wait_time:    Milliseconds to pause after each scroll. Defaults to 500.
+		timeout:      Max milliseconds to wait for a row to render. Defaults to 60000.
+		sep:          Row separator to split on in the browser. Defaults to None.
+
+	Returns:
+		A (texts, complete) tuple; texts holds the unique rows in order of
+		appearance when sep is given. complete is False when scrolling
+		stopped because the last rendered row had no index_attr.
 	"""
-	return container.evaluate("""el => {
-		return (el.scrollTop + el.clientHeight) >= el.scrollHeight;
-	}""")
+	result = container.evaluate(
+		"""async (el, { rowSelector, indexAttr, waitTime, timeout, sep }) => {
+			const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+			const splitText = """ + _SPLIT_TEXT_JS + """;
+			const texts = [];
+			const unique = new Set();
+
+			const collect = text => {
+				if (sep === null) {
+					texts.push(text);
+					return;
+				}
+
+				for (const row of splitText(text, sep, sep)) unique.add(row.trim());
+			};
+			const done = complete => ({ texts: sep === null ? texts : [...unique], complete });
+			let rowNum = 0;
+
+			while (true) {
+				const deadline = Date.now() + timeout;
+				while (!el.querySelector(`${rowSelector}[${indexAttr}='${rowNum}']`)) {
+					if (Date.now() > deadline) {
+						throw new Error(`Row ${rowNum} was not rendered within ${timeout}ms.`);
+					}
+					await sleep(100);
+				}
+
+				collect(el.innerText);
+
+				if ((el.scrollTop + el.clientHeight) >= el.scrollHeight) {
+					return done(true);
+				}
+
+				el.scrollBy(0, el.clientHeight / 3);
+
+				const rows = el.querySelectorAll(rowSelector);
+				const lastIndex = rows.length ? rows[rows.length - 1].getAttribute(indexAttr) : null;
+
+				if (lastIndex === null) {
+					return done(false);
+				}
+
+				rowNum = parseInt(lastIndex, 10);
+				await sleep(waitTime);
+			}
+		}""",
+		{
+			"rowSelector": row_selector,
+			"indexAttr": index_attr,
+			"waitTime": wait_time,
+			"timeout": timeout,
+			"sep": sep,
+		},
+	)
+	return result["texts"], result["complete"]
 
 
 #* ---------------------------------------------------------------------------
@@ -326,7 +603,78 @@ def is_locator_scrolled_to_bottom(container: Locator) -> bool:
 def sharepoint_close_editor() -> None:
 	"""Click the SharePoint editor's close button and wait for the UI to settle."""
 	sharepoint = PAGES["sharepoint"]
-	click_and_wait(wait_for(sharepoint, SHAREPOINT_DOM, at=["close"])[0], sharepoint)
+	editor_attr, _ = SHAREPOINT_DOM["editor"]
+	click_and_wait(
+		wait_for_one(sharepoint, SHAREPOINT_DOM, "close"),
+		sharepoint,
+		timeout=10000,
+		wait_until=ELEMENT_GONE,
+		wait_arg=editor_attr,
+	)
+
+
+#* Number of lines in the editor: the model's count when Monaco is exposed,
+#* otherwise the highest number in the gutter. The editor reveals the cursor
+#* after a paste, so the gutter always reaches the new last line, and wrapped
+#* rows never add numbers of their own
+_EDITOR_LINE_COUNT_JS = """gutterSelector => {
+	const models = window.monaco?.editor?.getModels?.() ?? [];
+	if (models.length) {
+		return Math.max(...models.map(model => model.getLineCount()));
+	}
+
+	const gutter = document.querySelector(gutterSelector);
+	if (gutter === null) return 0;
+	return Math.max(0, ...Array.from(gutter.children, child => parseInt(child.innerText, 10) || 0));
+}"""
+
+
+def sharepoint_paste_text(text: str, timeout: int = 5000) -> None:
+	"""
+	Paste text at the SharePoint editor's cursor via a synthetic ClipboardEvent.
+
+	The payload reaches the editor as a single paste instead of being typed
+	character by character, and the system clipboard is left untouched. The
+	paste is confirmed by the editor's line count growing by the number of
+	lines pasted; it is never retried, since a second attempt could append
+	the text twice.
+
+	Args:
+		text:    Text to insert at the cursor.
+		timeout: Max milliseconds to wait for the paste to show up. Defaults to 5000.
+
+	Raises:
+		SharePointPasteError: If the line count has not grown within timeout.
+	"""
+	sharepoint = PAGES["sharepoint"]
+	gutter_attr, _ = SHAREPOINT_DOM["row count"]
+	expected = sharepoint.evaluate(_EDITOR_LINE_COUNT_JS, gutter_attr) + text.count("\n")
+
+	sharepoint.evaluate(
+		"""text => {
+			const dt = new DataTransfer();
+			dt.setData("text/plain", text);
+
+			const pasteEvent = new ClipboardEvent("paste", {
+				clipboardData: dt,
+				bubbles: true,
+				cancelable: true
+			});
+
+			document.activeElement.dispatchEvent(pasteEvent);
+		}""",
+		text,
+	)
+
+	try:
+		sharepoint.wait_for_function(
+			f"""([gutterSelector, expected]) =>
+				({_EDITOR_LINE_COUNT_JS})(gutterSelector) >= expected""",
+			arg=[gutter_attr, expected],
+			timeout=timeout,
+		)
+	except PlaywrightTimeoutError as e:
+		raise SharePointPasteError(timeout) from e
 
 
 def sharepoint_rows(row: Locator) -> list[str]:
@@ -339,7 +687,7 @@ def sharepoint_rows(row: Locator) -> list[str]:
 	Returns:
 		List of line strings from the row's inner text.
 	"""
-	return str_normalize(row.inner_text()).split("\n")
+	return extract_row(row, "\n")
 
 
 def row_counter_info(row_counter: Locator) -> list[str]:
@@ -356,8 +704,9 @@ def row_counter_info(row_counter: Locator) -> list[str]:
 		List of text strings, one per direct child of the container.
 		Empty string for children that have no sub-children.
 	"""
-	return row_counter.evaluate_all("""nodes =>
-		Array.from(nodes[0].children).map(child => {
+	#* Only the first match is read, so hand just that one over to the page
+	return row_counter.first.evaluate("""root =>
+		Array.from(root.children).map(child => {
 			const n = child.children.length;
 			return n > 0 ? child.children[n - 1].innerText : "";
 		})
@@ -387,16 +736,26 @@ def observe_rows(
 			window[listName] = [...initialRows];
 
 			const observer = new MutationObserver(mutations => {
+				const added = [];
+
 				for (const mutation of mutations) {
 					for (const node of mutation.addedNodes) {
-						if (node.matches && node.matches(rowSelector)) {
-							window[listName].push(node.innerText);
-						}
+						// Text and comment nodes can never be rows
+						if (node.nodeType !== Node.ELEMENT_NODE) continue;
+						if (node.matches(rowSelector)) added.push(node.innerText);
 					}
 				}
+
+				if (added.length) window[listName].push(...added);
 			});
 
-			observer.observe(target, { childList: true, subtree: true });
+			// Only node insertions matter; text and attribute churn is ignored
+			observer.observe(target, {
+				childList: true,
+				subtree: true,
+				characterData: false,
+				attributes: false,
+			});
 		}""",
 		{"listName": list_name, "rowSelector": selector, "initialRows": initial_rows},
 	)
@@ -406,8 +765,9 @@ def get_new_rows(list_name: str) -> list[str]:
 	"""
 	Drain and return all rows accumulated in a browser-global list since the last call.
 
-	Uses splice(0, length) so the list is cleared atomically — rows appended
-	by the MutationObserver between the read and the clear are not lost.
+	Swaps in a fresh array rather than splicing the old one, so draining is
+	O(1) in the page. The swap runs in a single JS task, and the observer
+	looks the list up by name on every push, so no row is lost.
 
 	Args:
 		list_name: Name of the window-level JS array to drain.
@@ -416,5 +776,6 @@ def get_new_rows(list_name: str) -> list[str]:
 		All strings that were in the list at the moment of the call.
 	"""
 	return PAGES["sharepoint"].evaluate(
-		f"window['{list_name}'].splice(0, window['{list_name}'].length)"
+		"name => { const rows = window[name]; window[name] = []; return rows; }",
+		list_name,
 	)
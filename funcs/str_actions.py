@@ -1,4 +1,4 @@
-from .imports import uni
+from .imports import lru_cache, uni
 
 
 def str_normalize(text:str) -> str:
@@ -15,21 +15,14 @@ def str_normalize(text:str) -> str:
 		'é'
 	"""
 
-	return uni.normalize("NFKC", text)
+	#* ASCII text is already in NFKC form, which is the common case for SharePoint rows
+	if text.isascii():
+		return text
 
-def strip_edges(text:str, strip:str) -> str:
-	"""
-	Removes the specified substring from the start and end of the given text, if present.
-	Args:
-		text (str): The input string to process.
-		strip (str): The substring to remove from the start and end of the text.
-	Returns:
-		str: The resulting string with the specified substring removed from both edges, if present.
-	"""
+	return _nfkc(text)
+
+@lru_cache(maxsize=4096)
+def _nfkc(text:str) -> str:
+	"""Cached NFKC normalisation for non-ASCII text, which repeats across rows."""
 
-	if text.startswith(strip):
-		text = text[len(strip):]
-	if text.endswith(strip):
-		text = text[:-len(strip)]
-		
-	return text
+	return uni.normalize("NFKC", text)
@@ -1,20 +1,17 @@
 from .custom_types import FINDER
-from .imports import os
-from .env import (
-	URL_SHAREPOINT,
-	URL_POWERBI_SHOW,
-	URL_POWERBI_EXPORT
-)
+from .imports import MappingProxyType, os
+from .env import ENV
 
 
 EDGE_USER_DATA_DIR = os.path.expandvars(r"%LOCALAPPDATA%\Microsoft\Edge\User Data")
+LAST_PROFILE_PATH = "last_profile.txt"
 URLS = {
 	"outlook": "https://outlook.office.com/mail/",
-	"sharepoint": URL_SHAREPOINT,
-	"powerbi export": URL_POWERBI_EXPORT,
-	"powerbi show": URL_POWERBI_SHOW
+	"sharepoint": ENV.url_sharepoint,
+	"powerbi export": ENV.url_powerbi_export,
+	"powerbi show": ENV.url_powerbi_show
 }
-POWERBI_DOM: FINDER = {
+POWERBI_DOM: FINDER = MappingProxyType({
 	#? Western Europe overview
 	"we mau": (".pivotTable", "Market"),
 
@@ -22,6 +19,7 @@ POWERBI_DOM: FINDER = {
 	"snapshot": (".tableExContainer", None),
 	"snapshot container": ("transform", "Account Details (Managed Account Only)"),
 	"loader": (".powerbi-spinner", "shown"),
+	"active loader": (".powerbi-spinner.shown", None),
 	
 	#? Filter area
 	"dropdown button": ("[role='combobox'][aria-label='*attr*']", None),
@@ -40,8 +38,8 @@ POWERBI_DOM: FINDER = {
 	"mid": (".mid-viewport", None),
 	"row": (".row", None),
 	"index": ("row-index", None)
-}
-SHAREPOINT_DOM: FINDER = {
+})
+SHAREPOINT_DOM: FINDER = MappingProxyType({
 	#? Files
 	"snapshots": ("[data-id='heroField']", "Table Data.txt"),
 	"V-teams": ("[data-id='heroField']", "V-teams.txt"),
@@ -65,8 +63,8 @@ SHAREPOINT_DOM: FINDER = {
 	"save": ("button[id='saveCommand']", None),
 	"close": ("button[id='closeCommand']", None),
 	"popup": ("[role='alert']", "Saved")
-}
-OUTLOOK_DOM: FINDER = {
+})
+OUTLOOK_DOM: FINDER = MappingProxyType({
 	#? Commands
 	"new mail": ("button", "New mail"),
 	"reply": ("button[role='menuitem'][aria-label='Reply']", None),
@@ -75,9 +73,10 @@ OUTLOOK_DOM: FINDER = {
 	"reader": ("[data-app-section='MailReadCompose']", None),
 	"subject": ("input[aria-label='Subject']", None),
 	"field": ("[role='textbox']", None),
+	"suggestion": ("[role='option']", None),
 	"send": ("button[aria-label='Send']", None),
 	
 	#? Search bar and message
 	"search": ("input[id='topSearchInput']", None),
 	"message": ("[role='option'] [role='group']", None)
-}
+})
@@ -1,16 +1,23 @@
-from .imports import pd, BrowserContext, Page, TypedDict
+from .imports import pd, BrowserContext, Locator, Page, TypedDict, Any
 
 
 class Accounts(TypedDict):
 	data: pd.DataFrame | None
 	filter: list[str] | None
+	keys: pd.Series | None
+	dates: pd.Series | None
 
 ACCOUNTS: Accounts = {
 	"data": None,
 	"filter": None,
+	"keys": None,
+	"dates": None,
 }
 TEST = {
 	"active": True
 }
 BROWSER: dict[str, BrowserContext] = {}
 PAGES: dict[str, Page] = {}
+LOCATOR_CACHE: dict[tuple, tuple[Locator, float]] = {}
+WATCHED_PAGES: set[int] = set()
+COMPOSE_LOCATORS: dict[str, Any] = {}
@@ -1,4 +1,4 @@
-from .imports import Image, TypedDict
+from .imports import Image, Mapping, TypedDict
 
 
 class ExcluderItem(TypedDict):
@@ -6,5 +6,6 @@ class ExcluderItem(TypedDict):
 	pics: dict[str, str]
 
 IMG = Image.Image
-FINDER = dict[str, tuple[str, str | None]]
+FINDER = Mapping[str, tuple[str, str | None]]
 EXCLUDER = dict[str, dict[str, ExcluderItem]]
+VTEAM = Mapping[str, str]
@@ -1,15 +1,24 @@
-from .imports import load_dotenv, os
+from .imports import load_dotenv, dataclass, fields, os
 
 
-load_dotenv()
-DEFAULT_EMAILS = os.getenv("default_emails") or ""
+@dataclass(frozen=True, slots=True)
+class Env:
+	default_emails: str = ""
 
-TEST_EXCLUDED_NAMES = os.getenv("test_excluded_names") or ""
-TEST_EXCLUDED = os.getenv("test_excluded") or ""
+	test_excluded_names: str = ""
+	test_excluded: str = ""
 
-TEST_TO = os.getenv("test_to") or ""
-TEST_CC = os.getenv("test_cc") or ""
+	test_to: str = ""
+	test_cc: str = ""
 
-URL_SHAREPOINT = os.getenv("url_sharepoint") or ""
-URL_POWERBI_SHOW = os.getenv("url_powerbi_show") or ""
-URL_POWERBI_EXPORT = os.getenv("url_powerbi_export") or ""
+	url_sharepoint: str = ""
+	url_powerbi_show: str = ""
+	url_powerbi_export: str = ""
+
+
+def load_env() -> Env:
+	"""Load the .env file and read every Env field from the environment, defaulting to ""."""
+	load_dotenv()
+	return Env(**{field.name: os.getenv(field.name) or "" for field in fields(Env)})
+
+ENV = load_env()
@@ -1,7 +1,9 @@
 import os
 import pandas as pd
 from PIL import Image
-from typing import TypedDict
+from typing import Any, Mapping, TypedDict
+from types import MappingProxyType
+from dataclasses import dataclass, fields
 from dotenv import load_dotenv
-from playwright.sync_api import BrowserContext, Page
+from playwright.sync_api import BrowserContext, Locator, Page
 
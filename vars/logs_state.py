@@ -1,12 +1,18 @@
 EXCLUDED_MAIL_LOGS = {
 	"path": "excluded_mail_logs.txt",
-	"content": ""
+	"content": "",
+	"saved": 0,
+	"entries": 0
 }
 MAIL_LOGS = {
 	"path": "mail_logs.txt",
-	"content": ""
+	"content": "",
+	"saved": 0,
+	"entries": 0
 }
 LOGS = {
 	"path": "logs.txt",
-	"content": ""
+	"content": "",
+	"saved": 0,
+	"entries": 0
 }
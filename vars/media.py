@@ -10,6 +10,7 @@ DF2IMG_OPTIONS = {
 	"tbl_cells": dict(align="center", font=dict(color="black", size=12))
 }
 MEDIA: dict[str, IMG] = {}
+MEDIA_B64: dict[str, str] = {}
 MEDIA_LABELS = {
 "week progress": 0,
 "accounts": 1
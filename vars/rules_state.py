@@ -5,4 +5,5 @@ from .imports import pd
 MAIL_STRUCTURES: dict[str, pd.DataFrame] = {}
 ACTUAL: dict[str, pd.DataFrame] = {}
 SKIP: dict[str, pd.DataFrame] = {}
+SKIP_INDEX: dict[str, frozenset[str]] = {}
 EXCLUDED: EXCLUDER = {}